@@ -0,0 +1,41 @@
+"""Store ledger entry amounts as integer cents
+
+Revision ID: 333e4f6a1c19
+Revises: 8c49a6126268
+Create Date: 2026-10-15 06:09:29.997305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "333e4f6a1c19"
+down_revision: Union[str, None] = "8c49a6126268"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "ledger_entries", sa.Column("amount_cents", sa.BigInteger(), nullable=True)
+    )
+    op.execute(text("UPDATE ledger_entries SET amount_cents = round(amount * 100)"))
+    op.alter_column("ledger_entries", "amount_cents", nullable=False)
+    op.drop_column("ledger_entries", "amount")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "ledger_entries",
+        sa.Column("amount", sa.Numeric(precision=12, scale=2), nullable=True),
+    )
+    op.execute(text("UPDATE ledger_entries SET amount = amount_cents / 100.0"))
+    op.alter_column("ledger_entries", "amount", nullable=False)
+    op.drop_column("ledger_entries", "amount_cents")
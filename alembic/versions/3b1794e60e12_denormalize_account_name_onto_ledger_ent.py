@@ -0,0 +1,45 @@
+"""Denormalize account name onto ledger entries
+
+Revision ID: 3b1794e60e12
+Revises: 9d4a782f1d85
+Create Date: 2026-10-15 06:21:06.245359
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b1794e60e12"
+down_revision: Union[str, None] = "9d4a782f1d85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "ledger_entries", sa.Column("account_name", sa.String(100), nullable=True)
+    )
+    op.execute(
+        text(
+            "UPDATE ledger_entries e SET account_name = a.name "
+            "FROM accounts a WHERE a.id = e.account_id"
+        )
+    )
+    op.alter_column("ledger_entries", "account_name", nullable=False)
+    op.create_index(
+        "ix_entries_lower_account_name_date",
+        "ledger_entries",
+        [sa.text("lower(account_name)"), sa.text("date DESC")],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entries_lower_account_name_date", table_name="ledger_entries")
+    op.drop_column("ledger_entries", "account_name")
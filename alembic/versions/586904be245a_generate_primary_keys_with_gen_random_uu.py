@@ -0,0 +1,32 @@
+"""Generate primary keys with gen_random_uuid
+
+Revision ID: 586904be245a
+Revises: 333e4f6a1c19
+Create Date: 2026-10-15 06:13:29.190794
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "586904be245a"
+down_revision: Union[str, None] = "333e4f6a1c19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    for table in ("accounts", "ledger_entries"):
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("accounts", "ledger_entries"):
+        op.alter_column(table, "id", server_default=None)
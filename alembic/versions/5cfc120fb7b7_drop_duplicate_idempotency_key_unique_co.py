@@ -0,0 +1,33 @@
+"""Drop duplicate idempotency_key unique constraint
+
+Revision ID: 5cfc120fb7b7
+Revises: b4e03153b58d
+Create Date: 2026-10-15 06:07:31.319244
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5cfc120fb7b7"
+down_revision: Union[str, None] = "b4e03153b58d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 88b4b8ff4de7 created the named constraint plus an unnamed duplicate
+    op.drop_constraint(
+        "ledger_entries_idempotency_key_key", "ledger_entries", type_="unique"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint(
+        "ledger_entries_idempotency_key_key", "ledger_entries", ["idempotency_key"]
+    )
@@ -0,0 +1,35 @@
+"""Add covering index for ledger summary totals
+
+Revision ID: 79bd48b65d8a
+Revises: 7df084b568e3
+Create Date: 2026-10-15 06:30:44.304492
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "79bd48b65d8a"
+down_revision: Union[str, None] = "7df084b568e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_entries_active_type_amount",
+        "ledger_entries",
+        ["entry_type"],
+        postgresql_include=["amount_cents"],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entries_active_type_amount", table_name="ledger_entries")
@@ -0,0 +1,60 @@
+"""Make ledger entry listing indexes partial
+
+Revision ID: 7df084b568e3
+Revises: 3b1794e60e12
+Create Date: 2026-10-15 06:29:10.219309
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7df084b568e3"
+down_revision: Union[str, None] = "3b1794e60e12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # No query filters ledger entries by account_id and date, so stop paying
+    # for this index on every write
+    op.drop_index("ix_entries_account_date", table_name="ledger_entries")
+
+    # Listing always filters is_deleted = false; partial indexes skip deleted
+    # rows entirely and stay ordered for ORDER BY date DESC LIMIT n
+    op.drop_index("ix_entries_lower_account_name_date", table_name="ledger_entries")
+    op.create_index(
+        "ix_entries_lower_account_name_date",
+        "ledger_entries",
+        [sa.text("lower(account_name)"), sa.text("date DESC")],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+    op.drop_index("ix_entries_currency_date", table_name="ledger_entries")
+    op.create_index(
+        "ix_entries_currency_date",
+        "ledger_entries",
+        ["currency", sa.text("date DESC")],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entries_currency_date", table_name="ledger_entries")
+    op.create_index("ix_entries_currency_date", "ledger_entries", ["currency", "date"])
+    op.drop_index("ix_entries_lower_account_name_date", table_name="ledger_entries")
+    op.create_index(
+        "ix_entries_lower_account_name_date",
+        "ledger_entries",
+        [sa.text("lower(account_name)"), sa.text("date DESC")],
+    )
+    op.create_index(
+        "ix_entries_account_date",
+        "ledger_entries",
+        ["account_id", sa.text("date DESC")],
+    )
@@ -0,0 +1,42 @@
+"""Add ledger entry listing indexes
+
+Revision ID: 8c49a6126268
+Revises: 5cfc120fb7b7
+Create Date: 2026-10-15 06:09:09.883081
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c49a6126268"
+down_revision: Union[str, None] = "5cfc120fb7b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_entries_account_date",
+        "ledger_entries",
+        ["account_id", text("date DESC")],
+    )
+    op.create_index(
+        "ix_entries_active_date",
+        "ledger_entries",
+        ["date"],
+        postgresql_where=text("is_deleted = false"),
+    )
+    op.create_index("ix_entries_currency_date", "ledger_entries", ["currency", "date"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entries_currency_date", table_name="ledger_entries")
+    op.drop_index("ix_entries_active_date", table_name="ledger_entries")
+    op.drop_index("ix_entries_account_date", table_name="ledger_entries")
@@ -0,0 +1,29 @@
+"""Index accounts on lower name
+
+Revision ID: 9d4a782f1d85
+Revises: f6e32fe493e9
+Create Date: 2026-10-15 06:17:21.237165
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4a782f1d85"
+down_revision: Union[str, None] = "f6e32fe493e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_accounts_lower_name", "accounts", [sa.text("lower(name)")])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_accounts_lower_name", table_name="accounts")
@@ -0,0 +1,66 @@
+"""Add idempotency key fingerprint
+
+Revision ID: f6e32fe493e9
+Revises: 586904be245a
+Create Date: 2026-10-15 06:14:00.123162
+
+"""
+
+from hashlib import blake2b
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6e32fe493e9"
+down_revision: Union[str, None] = "586904be245a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _fingerprint(key: str) -> int:
+    """Hash an idempotency key to a signed 64-bit value, as of this revision."""
+    digest = blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "ledger_entries", sa.Column("idempotency_fp", sa.BigInteger(), nullable=True)
+    )
+
+    # blake2b is not available in SQL, so backfill existing keys from Python
+    conn = op.get_bind()
+    rows = conn.execute(
+        text(
+            "SELECT id, idempotency_key FROM ledger_entries "
+            "WHERE idempotency_key IS NOT NULL"
+        )
+    ).all()
+    if rows:
+        conn.execute(
+            text("UPDATE ledger_entries SET idempotency_fp = :fp WHERE id = :id"),
+            [{"id": r.id, "fp": _fingerprint(r.idempotency_key)} for r in rows],
+        )
+
+    op.create_unique_constraint(
+        "uq_ledger_entry_idempotency_fp", "ledger_entries", ["idempotency_fp"]
+    )
+    op.drop_constraint(
+        "uq_ledger_entry_idempotency_key", "ledger_entries", type_="unique"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint(
+        "uq_ledger_entry_idempotency_key", "ledger_entries", ["idempotency_key"]
+    )
+    op.drop_constraint(
+        "uq_ledger_entry_idempotency_fp", "ledger_entries", type_="unique"
+    )
+    op.drop_column("ledger_entries", "idempotency_fp")
@@ -1,28 +1,71 @@
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+from dataclasses import dataclass, field
 
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
 
-class Settings(BaseSettings):
+# Local development reads .env; real environment variables take precedence
+load_dotenv(".env", encoding="utf-8", override=False)
+
+
+def _env(name: str, default: str | None = None) -> str:
+    value = os.environ.get(name, default)
+    if value is None:
+        raise RuntimeError(f"Missing required environment variable: {name}")
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     # Project Metadata
-    project_name: str = "General Ledger"
+    project_name: str = field(
+        default_factory=lambda: _env("PROJECT_NAME", "General Ledger")
+    )
 
     # PostgreSQL
-    postgres_user: str
-    postgres_password: str
-    postgres_db: str
-    postgres_host: str
-    postgres_port: int
+    postgres_user: str = field(default_factory=lambda: _env("POSTGRES_USER"))
+    postgres_password: str = field(default_factory=lambda: _env("POSTGRES_PASSWORD"))
+    postgres_db: str = field(default_factory=lambda: _env("POSTGRES_DB"))
+    postgres_host: str = field(default_factory=lambda: _env("POSTGRES_HOST"))
+    postgres_port: int = field(default_factory=lambda: int(_env("POSTGRES_PORT")))
+
+    # Connection pool
+    db_pool_size: int = field(default_factory=lambda: int(_env("DB_POOL_SIZE", "20")))
+    db_max_overflow: int = field(
+        default_factory=lambda: int(_env("DB_MAX_OVERFLOW", "30"))
+    )
+    db_pool_timeout: int = field(
+        default_factory=lambda: int(_env("DB_POOL_TIMEOUT", "10"))
+    )
+    db_pool_recycle: int = field(
+        default_factory=lambda: int(_env("DB_POOL_RECYCLE", "1800"))
+    )
+
+    # Comma-separated browser origins allowed by CORS (the Next.js frontend)
+    cors_origins: tuple[str, ...] = field(
+        default_factory=lambda: tuple(
+            o.strip()
+            for o in _env("CORS_ORIGINS", "http://localhost:3000").split(",")
+            if o.strip()
+        )
+    )
 
     # Other settings
-    sentry_dsn: str = ""  # Optional if Sentry is configured to capture logs
+    sentry_dsn: str = field(
+        default_factory=lambda: _env("SENTRY_DSN", "")
+    )  # Optional if Sentry is configured to capture logs
 
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+    # Derived once in __post_init__ (slots rule out cached_property)
+    DATABASE_URL: str = field(init=False)
 
-    @property
-    def DATABASE_URL(self) -> str:
-        return (
+    def __post_init__(self) -> None:
+        url = (
             f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
+        # Fail fast on a malformed URL instead of at engine creation
+        make_url(url)
+        object.__setattr__(self, "DATABASE_URL", url)
 
 
 settings = Settings()
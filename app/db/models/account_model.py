@@ -9,27 +9,41 @@ Description: SQLAlchemy model definition for Account entity, which holds
 
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime
+from sqlalchemy import String, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
-from typing import List
+from typing import TYPE_CHECKING
 from app.db.session import Base
 
+if TYPE_CHECKING:
+    from app.db.models.ledger_entry_model import DBLedgerEntry
+
 
 class DBAccount(Base):
     __tablename__ = "accounts"
+    # Serves the case-insensitive lower(name) = :name filter on entry listings
+    __table_args__ = (Index("ix_accounts_lower_name", text("lower(name)")),)
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    name: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+    id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+        default=None,
+    )
+    name: Mapped[str] = mapped_column(
+        String(100), unique=True, index=True, default=None
+    )
     is_active: Mapped[bool] = mapped_column(default=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
+        default=None,
     )
 
-    entries: Mapped[list["DBLedgerEntry"]] = relationship(back_populates="account")
-
-
-# Avoiding circular imports
-from app.db.models.ledger_entry_model import DBLedgerEntry
+    # One-to-many: never loaded implicitly. Listing accounts must not fan out
+    # into ledger entries; query entries explicitly when they are needed.
+    entries: Mapped[list["DBLedgerEntry"]] = relationship(
+        back_populates="account", lazy="raise", init=False, repr=False
+    )
@@ -8,19 +8,23 @@ Description: SQLAlchemy model definition for LedgerEntry, representing
 """
 
 import uuid
-from decimal import Decimal
+from hashlib import blake2b
+from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime
 from sqlalchemy import (
+    BigInteger,
     ForeignKey,
     String,
-    Enum,
-    Numeric,
     DateTime,
     Text,
     UniqueConstraint,
+    Index,
+    text,
 )
+from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 from app.db.session import Base
 from app.db.models.account_model import DBAccount
 
@@ -33,37 +37,120 @@ class EntryType(enum.Enum):
     credit = "credit"
 
 
+def idempotency_fingerprint(key: str) -> int:
+    """Hash an idempotency key to the signed 64-bit value stored in idempotency_fp."""
+    digest = blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def to_cents(amount: Decimal) -> int:
+    """Convert a 2-decimal money amount to integer cents."""
+    return int((amount * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+class Cents(TypeDecorator):
+    """Stores a money amount as BIGINT cents and exposes it as a Decimal."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(Decimal(value))
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else Decimal(value).scaleb(-2)
+
+
 class DBLedgerEntry(Base):
     __tablename__ = "ledger_entries"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+        default=None,
+    )
     account_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("accounts.id"), nullable=False
+        PG_UUID(as_uuid=True), ForeignKey("accounts.id"), nullable=False, default=None
+    )
+    # Copy of accounts.name so reads never join accounts; update_account keeps
+    # it in sync on rename
+    account_name: Mapped[str] = mapped_column(String(100), nullable=False, default=None)
+    date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=None
+    )
+    # Bind to the existing native "entrytype" type; it is managed by migrations
+    entry_type: Mapped[EntryType] = mapped_column(
+        PG_ENUM(
+            EntryType,
+            name="entrytype",
+            create_type=False,
+            values_callable=lambda e: [m.value for m in e],
+        ),
+        nullable=False,
+        default=None,
+    )
+    amount: Mapped[Decimal] = mapped_column(
+        "amount_cents", Cents, nullable=False, default=None
     )
-    date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    entry_type: Mapped[EntryType] = mapped_column(Enum(EntryType), nullable=False)
-    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     currency: Mapped[str] = mapped_column(String(3), default="USD")
-    description: Mapped[str] = mapped_column(Text, nullable=True)
+    description: Mapped[str] = mapped_column(Text, nullable=True, default=None)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), server_default=func.now(), default=None
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        default=None,
     )
     is_deleted: Mapped[bool] = mapped_column(default=False)
     version: Mapped[int] = mapped_column(default=1)
     idempotency_key: Mapped[Optional[str]] = mapped_column(
-        String(64), unique=True, nullable=True
+        String(64), nullable=True, default=None
+    )
+    # Uniqueness is enforced on the 8-byte fingerprint; the raw key is kept
+    # for auditing and to confirm a fingerprint match.
+    idempotency_fp: Mapped[Optional[int]] = mapped_column(
+        BigInteger, nullable=True, default=None
     )
 
     __table_args__ = (
-        UniqueConstraint("idempotency_key", name="uq_ledger_entry_idempotency_key"),
+        UniqueConstraint("idempotency_fp", name="uq_ledger_entry_idempotency_fp"),
+        Index(
+            "ix_entries_active_date",
+            "date",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # Lets the summary's FILTER aggregates run as an index-only scan
+        Index(
+            "ix_entries_active_type_amount",
+            "entry_type",
+            postgresql_include=["amount_cents"],
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index(
+            "ix_entries_currency_date",
+            "currency",
+            text("date DESC"),
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index(
+            "ix_entries_lower_account_name_date",
+            text("lower(account_name)"),
+            text("date DESC"),
+            postgresql_where=text("is_deleted = false"),
+        ),
     )
 
-    account: Mapped[DBAccount] = relationship(back_populates="entries")
-
-    @property
-    def account_name(self) -> str:
-        return self.account.name if self.account else None
+    # Many-to-one. Reads use the denormalized account_name, so the account is
+    # never loaded implicitly; join or query it explicitly when needed.
+    # Not a constructor argument: a dataclass default of None would clear
+    # account_id on flush. Pass account_id, or assign .account after creating.
+    account: Mapped[DBAccount] = relationship(
+        back_populates="entries",
+        lazy="raise",
+        init=False,
+        repr=False,
+    )
@@ -1,27 +1,83 @@
 # app/db/session.py
 
+import asyncio
+import logging
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.ext.asyncio import (
+    AsyncAttrs,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Async engine
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,
+    # Reuse the most recently returned connection so the warm ones stay busy and
+    # the rest can age out instead of being cycled by occasional probes
+    pool_use_lifo=True,
+    pool_recycle=settings.db_pool_recycle,
+    pool_timeout=settings.db_pool_timeout,
+    # Always ROLLBACK on checkin so returned connections are never idle in tx
+    pool_reset_on_return="rollback",
+    # Room for every statement shape plus lambda_stmt variants without eviction
+    query_cache_size=1200,
+    connect_args={
+        # PG JIT adds planning stalls on short OLTP queries
+        "server_settings": {"jit": "off", "application_name": "general-ledger"},
+        "command_timeout": 30,
+        # asyncpg's own statement cache and SQLAlchemy's prepared-statement cache
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 1024,
+    },
+)
+
+
+# Startup should not wait out asyncpg's 60s connect timeout on an unreachable DB
+PREWARM_TIMEOUT = 5.0
+
+
+async def prewarm_pool(size: int, timeout: float = PREWARM_TIMEOUT) -> None:
+    """Open up to `size` pooled connections so early requests skip the connect."""
+    # All checked out at once, otherwise the pool would hand back the same one.
+    # Each connect gets its own timeout so the ones that succeed are still
+    # returned to the pool instead of being lost to a cancelled gather
+    results = await asyncio.gather(
+        *(asyncio.wait_for(engine.connect(), timeout) for _ in range(size)),
+        return_exceptions=True,
+    )
+    conns = [r for r in results if not isinstance(r, BaseException)]
+    # Closing returns each connection to the pool, still open
+    await asyncio.gather(*(conn.close() for conn in conns))
+    if len(conns) < size:
+        logger.warning("Pre-warmed %d of %d pool connections", len(conns), size)
+
 
 # Async session factory
-async_session_factory = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
+async_session_factory = async_sessionmaker(
+    engine,
     expire_on_commit=False,
+    autoflush=False,
 )
 
 
-# Dependency injectable session
+# Dependency injectable session: one connection and one transaction per request.
+# Services flush instead of committing; the transaction commits when the request
+# completes and rolls back if it raises.
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
+    async with async_session_factory() as session, session.begin():
         yield session
 
 
-# Declarative base class with async support
-class Base(AsyncAttrs, DeclarativeBase):
+# Declarative base class with async support. Models are dataclasses so the
+# generated __init__ assigns fields directly; eq=False keeps identity semantics.
+class Base(AsyncAttrs, MappedAsDataclass, DeclarativeBase, kw_only=True, eq=False):
     pass
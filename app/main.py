@@ -1,11 +1,11 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
-from app.db.session import get_session, engine
+from app.db.session import engine, prewarm_pool
 
 from app.routes.accounts import router as accounts_router
 from app.routes.entries import router as entries_router
@@ -13,6 +13,7 @@ from app.routes.summary import router as summary_router
 
 import logging
 from app.utils.logger import setup_logging
+from app.utils.currency import close_http_client, warm_rate_cache
 
 import sentry_sdk
 from sentry_sdk.scrubber import EventScrubber
@@ -22,12 +23,29 @@ from sentry_sdk.integrations.fastapi import FastApiIntegration
 setup_logging()  # Optional: setup_logging("DEBUG")
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the connection pool to drain on shutdown
+ENGINE_DISPOSE_TIMEOUT = 5.0
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manages application startup and shutdown events."""
+    # Connect the steady-state pool up front instead of on the first requests
+    await prewarm_pool(settings.db_pool_size)
+    # Fetch the Treasury rate in the background so the first requests don't
+    # pay the HTTP round trip serially before their queries
+    warm_task = asyncio.create_task(warm_rate_cache())
     yield
-    await engine.dispose()  # Close all pooled connections
+    warm_task.cancel()
+    await close_http_client()
+    # Close all pooled connections, but don't let a stuck connection hang shutdown
+    try:
+        await asyncio.wait_for(engine.dispose(), timeout=ENGINE_DISPOSE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(
+            "engine.dispose() timed out after %ss, exiting without a clean close",
+            ENGINE_DISPOSE_TIMEOUT,
+        )
     logging.info("Shutting down... Lifespan complete.")
 
 
@@ -60,14 +78,17 @@ app = FastAPI(
     version="0.1.0",
     description="General Ledger API",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Explicit lists instead of wildcards; max_age lets browsers cache preflights
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=list(settings.cors_origins),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["authorization", "content-type", "idempotency-key"],
+    max_age=86400,
 )
 
 app.include_router(accounts_router, prefix="/api")
@@ -82,11 +103,13 @@ async def healthcheck():
 
 
 @app.get("/test-db", tags=["Health"])
-async def test_db(session: AsyncSession = Depends(get_session)):
+async def test_db():
     """Test database connection."""
+    # Plain engine connection: no session, unit of work, or transaction wrapper
     try:
-        result = await session.execute(text("SELECT version();"))
-        version = result.scalar()
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql("SELECT version()")
+            version = result.scalar()
         return {"message": "Database connected", "version": version}
     except Exception as e:
         return {"error": f"Failed to connect to database: {str(e)}"}
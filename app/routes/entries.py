@@ -7,8 +7,10 @@ Description: Handles creation, retrieval, update, and deletion of ledger entries
 """
 
 import logging
+from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, Path, Query, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
@@ -18,6 +20,7 @@ from app.schemas.ledger_entry_schema import (
     LedgerEntryOut,
     LedgerEntryDeletedResponse,
     LedgerEntryListResponse,
+    EntryType,
 )
 from app.services.entry_service import (
     create_entry,
@@ -55,14 +58,14 @@ async def create_entry_route(
 async def list_entries_route(
     account_name: Optional[str] = Query(default=None),
     currency: Optional[str] = Query(default=None),
-    entry_type: Optional[str] = Query(default=None),
-    start_date: Optional[str] = Query(default=None),
-    end_date: Optional[str] = Query(default=None),
+    entry_type: Optional[EntryType] = Query(default=None),
+    start_date: Optional[datetime] = Query(default=None),
+    end_date: Optional[datetime] = Query(default=None),
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
     db: AsyncSession = Depends(get_session),
-) -> LedgerEntryListResponse:
-    return await list_entries(
+) -> ORJSONResponse:
+    result = await list_entries(
         db=db,
         account_name=account_name,
         currency=currency,
@@ -72,6 +75,9 @@ async def list_entries_route(
         limit=limit,
         offset=offset,
     )
+    # Dump once and return directly, skipping FastAPI's second pass through
+    # response_model (which stays declared for the OpenAPI schema)
+    return ORJSONResponse(content=result.model_dump(mode="json"))
 
 
 @router.get(
@@ -8,6 +8,7 @@ Description: Handles summarization logic for ledger entries, including debit/cre
 
 import logging
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
@@ -31,7 +32,9 @@ router = APIRouter(prefix="/summary", tags=["Summary"])
 )
 async def get_summary_route(
     db: AsyncSession = Depends(get_session),
-) -> SummaryOut:
-    return await get_summary(
+) -> ORJSONResponse:
+    summary = await get_summary(
         db=db,
     )
+    # Serialized once with orjson; response_model stays for the OpenAPI schema
+    return ORJSONResponse(content=summary.model_dump(mode="json"))
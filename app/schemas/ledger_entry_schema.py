@@ -8,14 +8,38 @@ Description: Pydantic schema definitions for ledger entries, including models
              within the general ledger system.
 """
 
-from pydantic import BaseModel, Field, ConfigDict, StringConstraints
+import re
+
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict, field_validator
 from uuid import UUID
 from decimal import Decimal
 from enum import Enum
-from typing import Optional, List, Annotated, Literal
+from typing import Optional, List, Annotated
 from datetime import datetime
 
 
+# Shared constrained types, declared once and reused by every model below
+MoneyAmount = Annotated[Decimal, Field(ge=0)]
+OptionalMoneyAmount = Annotated[Optional[Decimal], Field(ge=0)]
+IDEMPOTENCY_KEY_RE = re.compile(r"[A-Za-z0-9_-]{8,64}")
+
+
+def _check_idempotency_key(value: str) -> str:
+    """Strip surrounding whitespace and require 8-64 URL-safe characters."""
+    value = value.strip()
+    if not IDEMPOTENCY_KEY_RE.fullmatch(value):
+        raise ValueError(
+            "Idempotency key must be 8-64 characters of letters, digits, '-' or '_'"
+        )
+    return value
+
+
+IdempotencyKey = Annotated[str, AfterValidator(_check_idempotency_key)]
+
+# Extend here to accept more currencies; the schema itself does not change
+SUPPORTED_CURRENCIES = frozenset({"USD"})
+
+
 class EntryType(str, Enum):
     debit = "debit"
     credit = "credit"
@@ -30,25 +54,37 @@ class LedgerEntryBase(BaseModel):
 
     entry_type: EntryType = Field(..., description="Type of entry: debit or credit")
 
-    amount: Decimal = Field(..., ge=0, description="Amount (must be ≥ 0)")
+    amount: MoneyAmount = Field(..., description="Amount (must be ≥ 0)")
 
-    currency: Literal["USD"] = Field(
+    currency: str = Field(
         ..., description="Currency code (only 'USD' supported for now)"
     )
 
     description: Optional[str] = Field(None, description="Optional description")
 
-    idempotency_key: Annotated[
-        str, StringConstraints(strip_whitespace=True, min_length=8, max_length=64)
-    ] = Field(..., description="Idempotency key to prevent duplicate entries")
+    idempotency_key: str = Field(
+        ..., description="Idempotency key to prevent duplicate entries"
+    )
 
 
 class LedgerEntryCreate(LedgerEntryBase):
-    pass
+    # Key format and currency are only enforced on input; stored rows pass as-is
+    idempotency_key: IdempotencyKey = Field(
+        ..., description="Idempotency key to prevent duplicate entries"
+    )
+
+    @field_validator("currency", mode="before")
+    @classmethod
+    def check_currency(cls, v):
+        if not isinstance(v, str) or v not in SUPPORTED_CURRENCIES:
+            raise ValueError(
+                f"Unsupported currency; expected one of {sorted(SUPPORTED_CURRENCIES)}"
+            )
+        return v
 
 
 class LedgerEntryUpdate(BaseModel):
-    amount: Optional[Decimal] = Field(None, ge=0)
+    amount: OptionalMoneyAmount = None
     description: Optional[str] = None
 
 
@@ -68,7 +104,7 @@ class LedgerEntryOut(LedgerEntryBase):
     updated_at: datetime
     is_deleted: bool
     version: int
-    canadian_amount: Optional[Decimal] = Field(
+    canadian_amount: OptionalMoneyAmount = Field(
         None,
         description="Amount converted to Canadian Dollars using latest Treasury rate",
     )
@@ -8,11 +8,11 @@ Description: Service functions for creating, updating, and retrieving accounts.
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
+from sqlalchemy import insert, select, update as sql_update
 from fastapi import HTTPException
 from uuid import UUID
 
-from app.db.models import DBAccount
+from app.db.models import DBAccount, DBLedgerEntry
 from app.schemas.account_schema import (
     AccountCreate,
     AccountUpdate,
@@ -23,6 +23,7 @@ from app.utils.db_helpers import (
     get_account_or_raise_404,
     account_name_exists,
     get_account_by_name,
+    clear_account_cache,
 )
 import logging
 from sentry_sdk import capture_message, capture_exception
@@ -37,10 +38,13 @@ async def create_account(account: AccountCreate, db: AsyncSession) -> AccountOut
 
     if existing is None:
         # No conflict – create new account
-        new_account = DBAccount(name=account.name, is_active=account.is_active)
-        db.add(new_account)
-        await db.commit()
-        await db.refresh(new_account)
+        # RETURNING hands back the server-generated id and created_at
+        stmt = (
+            insert(DBAccount)
+            .values(name=account.name, is_active=account.is_active)
+            .returning(DBAccount)
+        )
+        new_account = (await db.execute(stmt)).scalar_one()
         logger.info("Created new account: %s", new_account.name)
         return AccountOut.model_validate(new_account)
 
@@ -53,8 +57,7 @@ async def create_account(account: AccountCreate, db: AsyncSession) -> AccountOut
 
     # Account exists but is inactive – reactivate
     existing.is_active = True
-    await db.commit()
-    await db.refresh(existing)
+    await db.flush()
     logger.info("Reactivated inactive account: %s", existing.name)
     return AccountOut.model_validate(existing)
 
@@ -71,18 +74,24 @@ async def update_account(
         if await account_name_exists(update.name, db):
             raise HTTPException(status_code=400, detail="Account name already exists")
         account.name = update.name
+        # Keep the denormalized copy on ledger entries in sync
+        await db.execute(
+            sql_update(DBLedgerEntry)
+            .where(DBLedgerEntry.account_id == account.id)
+            .values(account_name=update.name)
+        )
 
     if update.is_active is not None:
         account.is_active = update.is_active
 
     try:
-        await db.commit()
-        await db.refresh(account)
+        await db.flush()
+        clear_account_cache()
         logger.info("Updated account_id=%s", account.id)
         return AccountOut.model_validate(account)
 
     except IntegrityError as e:
-        await db.rollback()
+        # The request transaction is rolled back by get_session
         capture_exception(e)
         raise HTTPException(status_code=400, detail="Account name already exists")
 
@@ -90,13 +99,14 @@ async def update_account(
 async def list_active_accounts(db: AsyncSession) -> AccountListResponse:
     """Return all active accounts for use in dropdowns or entry creation."""
     logger.info("Listing active accounts")
+    # Plain columns straight into model_construct: DB rows are trusted, so
+    # neither ORM hydration nor per-row validation is needed
     stmt = (
-        select(DBAccount)
+        select(DBAccount.id, DBAccount.name, DBAccount.is_active, DBAccount.created_at)
         .where(DBAccount.is_active.is_(True))
         .order_by(DBAccount.name.asc())
     )
     result = await db.execute(stmt)
-    accounts = result.scalars().all()
-    return AccountListResponse(
-        accounts=[AccountOut.model_validate(a) for a in accounts]
+    return AccountListResponse.model_construct(
+        accounts=[AccountOut.model_construct(**row) for row in result.mappings()]
     )
@@ -9,16 +9,39 @@ Description: Service functions for creating, retrieving, updating, and deleting
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import List
+from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select, func
+from sqlalchemy import (
+    BigInteger,
+    Numeric,
+    cast,
+    func,
+    lambda_stmt,
+    literal,
+    null,
+    or_,
+    select,
+    type_coerce,
+    update as sql_update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.utils.ledger_helpers import inject_cad_amount, get_usd_to_cad_rate
-from app.utils.db_helpers import get_entry_or_raise_404, get_active_account_by_name
-from app.db.models.ledger_entry_model import DBLedgerEntry
-from app.db.models.account_model import DBAccount
+from app.utils.ledger_helpers import (
+    build_entry_out,
+    entry_out_from_row,
+    entry_to_out,
+    get_usd_to_cad_rate,
+    normalize_entry_type,
+)
+from app.utils.db_helpers import (
+    clear_account_cache,
+    get_active_account_id,
+    get_entry_or_raise_404,
+)
+from app.db.models import DBAccount
+from app.db.models.ledger_entry_model import DBLedgerEntry, idempotency_fingerprint
 from app.schemas.ledger_entry_schema import (
     LedgerEntryCreate,
     LedgerEntryOut,
@@ -32,68 +55,143 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Columns needed to build a LedgerEntryOut without loading ORM objects, in
+# ENTRY_OUT_FIELDS order so listing rows can be consumed positionally
+_LIST_COLUMNS = (
+    DBLedgerEntry.id,
+    DBLedgerEntry.account_id,
+    DBLedgerEntry.account_name,
+    DBLedgerEntry.date,
+    DBLedgerEntry.entry_type,
+    DBLedgerEntry.amount,
+    DBLedgerEntry.currency,
+    DBLedgerEntry.description,
+    DBLedgerEntry.idempotency_key,
+    DBLedgerEntry.created_at,
+    DBLedgerEntry.updated_at,
+    DBLedgerEntry.is_deleted,
+    DBLedgerEntry.version,
+)
 
-async def create_entry(entry: LedgerEntryCreate, db: AsyncSession) -> LedgerEntryOut:
-    """Create a new ledger entry after validating account and input rules."""
-    logger.info("Creating ledger entry with idempotency_key=%s", entry.idempotency_key)
-    # Validate account
-    account = await get_active_account_by_name(entry.account_name, db)
 
-    # Check idempotency key: if an entry with same key already exists
-    existing = await db.execute(
-        select(DBLedgerEntry).where(
-            DBLedgerEntry.idempotency_key == str(entry.idempotency_key)
+def _cad_amount_column(usd_to_cad: Decimal):
+    """SQL expression for the CAD amount of a row, rounded to cents."""
+    # Strip the Cents type and CAST to NUMERIC, so the rate parameter is
+    # inferred as NUMERIC rather than BIGINT
+    cents = cast(type_coerce(DBLedgerEntry.amount, BigInteger), Numeric)
+    return func.round(cents * usd_to_cad / 100, 2, type_=Numeric(asdecimal=True)).label(
+        "canadian_amount"
+    )
+
+
+def _insert_entry_stmt(entry: LedgerEntryCreate, account_id: UUID, idempotency_fp: int):
+    """INSERT ... SELECT of a new entry, skipped on an idempotency conflict.
+
+    The row is selected from accounts, so account_name is the stored name and
+    nothing is inserted unless account_id is still the active account with
+    that name; a cached id that has since been renamed away inserts nothing.
+    """
+    values = {
+        DBLedgerEntry.entry_type: entry.entry_type,
+        DBLedgerEntry.amount: entry.amount,
+        DBLedgerEntry.currency: entry.currency,
+        DBLedgerEntry.description: entry.description,
+        DBLedgerEntry.date: entry.date or datetime.now(timezone.utc),
+        DBLedgerEntry.idempotency_key: entry.idempotency_key,
+        DBLedgerEntry.idempotency_fp: idempotency_fp,
+    }
+    source = select(
+        DBAccount.id,
+        DBAccount.name,
+        *(literal(value, column.type) for column, value in values.items()),
+    ).where(
+        DBAccount.id == account_id,
+        DBAccount.name == entry.account_name,
+        DBAccount.is_active.is_(True),
+    )
+    return (
+        pg_insert(DBLedgerEntry)
+        .from_select(
+            [DBLedgerEntry.account_id, DBLedgerEntry.account_name, *values], source
         )
+        .on_conflict_do_nothing(index_elements=[DBLedgerEntry.idempotency_fp])
+        .returning(*(col.label(col.key) for col in _LIST_COLUMNS))
     )
-    existing_entry = existing.scalar_one_or_none()
-
-    if existing_entry:
-        # Strict idempotency enforcement: reject if any data differs
-        if (
-            existing_entry.account_id != account.id
-            or existing_entry.entry_type != entry.entry_type
-            or existing_entry.amount != entry.amount
-            or existing_entry.currency != entry.currency
-            or (existing_entry.description or "") != (entry.description or "")
-        ):
-            capture_message(
-                f"Idempotency conflict: key={entry.idempotency_key}", level="warning"
+
+
+async def create_entry(entry: LedgerEntryCreate, db: AsyncSession) -> LedgerEntryOut:
+    """Create a new ledger entry after validating account and input rules."""
+    logger.info("Creating ledger entry with idempotency_key=%s", entry.idempotency_key)
+    idempotency_fp = idempotency_fingerprint(entry.idempotency_key)
+
+    # Happy path is a single statement: insert, or do nothing if the
+    # idempotency fingerprint already exists. A second pass only runs when the
+    # cached account id turned out to be stale
+    for _ in range(2):
+        # Validate account
+        account_id = await get_active_account_id(entry.account_name, db)
+        insert_stmt = _insert_entry_stmt(entry, account_id, idempotency_fp)
+        created = (await db.execute(insert_stmt)).mappings().one_or_none()
+
+        if created is not None:
+            usd_to_cad = await get_usd_to_cad_rate()
+            logger.info(
+                "Ledger entry created successfully: idempotency_key=%s",
+                entry.idempotency_key,
             )
-            raise HTTPException(
-                status_code=409,  # Conflict status code
-                detail="Idempotency key already used with different data",
+            return build_entry_out(created, usd_to_cad)
+
+        # Conflict: an entry with this key already exists
+        existing = await db.execute(
+            lambda_stmt(
+                lambda: select(DBLedgerEntry).where(
+                    DBLedgerEntry.idempotency_fp == idempotency_fp
+                )
             )
-        logger.info("Idempotency match found. Returning existing entry.")
-        return LedgerEntryOut.model_validate(existing_entry)
-
-    # Create DB object
-    new_entry = DBLedgerEntry(
-        account_id=account.id,
-        entry_type=entry.entry_type,
-        amount=entry.amount,
-        currency=entry.currency,
-        description=entry.description,
-        date=entry.date or datetime.now(timezone.utc),
-        idempotency_key=entry.idempotency_key,
-    )
-    db.add(new_entry)
-    await db.commit()
-    await db.refresh(new_entry)
-
-    # Injecting USD -> CAD conversion into entry
-    usd_entry = await inject_cad_amount(new_entry)
-    logger.info(
-        "Ledger entry created successfully: idempotency_key=%s", entry.idempotency_key
-    )
-    return usd_entry
+        )
+        existing_entry = existing.scalar_one_or_none()
+        if existing_entry is not None:
+            break
+        # Nothing inserted and no conflict: the cached account has since been
+        # renamed, deactivated or deleted, so look the name up again
+        clear_account_cache()
+    else:
+        raise HTTPException(status_code=404, detail="Account not found or inactive")
+
+    # Strict idempotency enforcement: reject if any data differs
+    if (
+        existing_entry.idempotency_key != entry.idempotency_key
+        or existing_entry.account_id != account_id
+        or normalize_entry_type(existing_entry.entry_type) != entry.entry_type.value
+        or existing_entry.amount != entry.amount
+        or existing_entry.currency != entry.currency
+        or (existing_entry.description or "") != (entry.description or "")
+    ):
+        capture_message(
+            f"Idempotency conflict: key={entry.idempotency_key}", level="warning"
+        )
+        raise HTTPException(
+            status_code=409,  # Conflict status code
+            detail="Idempotency key already used with different data",
+        )
+    logger.info("Idempotency match found. Returning existing entry.")
+    return entry_to_out(existing_entry)
 
 
 async def get_entry_by_id(entry_id: str, db: AsyncSession) -> LedgerEntryOut:
     """Fetch a single ledger entry by ID, excluding deleted records."""
-    entry = await get_entry_or_raise_404(entry_id, db)
-    # Injecting USD -> CAD conversion into entry
-    usd_entry = await inject_cad_amount(entry)
-    return usd_entry
+    # One projected SELECT that also computes the CAD amount, the same shape
+    # as a listing row; no ORM object is loaded
+    usd_to_cad = await get_usd_to_cad_rate()
+    stmt = lambda_stmt(
+        lambda: select(*_LIST_COLUMNS, _cad_amount_column(usd_to_cad)).where(
+            DBLedgerEntry.id == entry_id, DBLedgerEntry.is_deleted.is_(False)
+        )
+    )
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Ledger entry not found")
+    return entry_out_from_row(row)
 
 
 async def update_entry(
@@ -103,110 +201,152 @@ async def update_entry(
     if update.amount is None and update.description is None:
         raise HTTPException(status_code=400, detail="No fields provided to update")
 
-    entry = await get_entry_or_raise_404(entry_id, db)
-
-    # Check if any actual change is being made
-    changes_detected = False
-
-    if update.amount is not None and update.amount != entry.amount:
-        changes_detected = True
+    # The no-op check lives in the WHERE clause, so a real change is one
+    # UPDATE ... RETURNING instead of SELECT, modify, flush
+    values = {}
+    changes = []
+    if update.amount is not None:
+        values["amount"] = update.amount
+        changes.append(DBLedgerEntry.amount != update.amount)
+    if update.description is not None:
+        values["description"] = update.description
+        changes.append(
+            func.coalesce(DBLedgerEntry.description, "") != (update.description or "")
+        )
 
-    if update.description is not None and (update.description or "") != (
-        entry.description or ""
-    ):
-        changes_detected = True
+    stmt = (
+        sql_update(DBLedgerEntry)
+        .where(
+            DBLedgerEntry.id == entry_id,
+            DBLedgerEntry.is_deleted.is_(False),
+            or_(*changes),
+        )
+        .values(
+            **values,
+            updated_at=func.now(),
+            version=DBLedgerEntry.version + 1,
+        )
+        .returning(*(col.label(col.key) for col in _LIST_COLUMNS))
+        .execution_options(synchronize_session=False)
+    )
+    row = (await db.execute(stmt)).mappings().one_or_none()
 
-    if not changes_detected:
+    if row is None:
+        # Either missing or unchanged; only this path pays for a lookup
+        await get_entry_or_raise_404(entry_id, db)
         capture_message(f"No changes detected in update", level="warning")
         raise HTTPException(status_code=400, detail="No changes detected in update")
 
-    # Apply changes
-    if update.amount is not None:
-        entry.amount = update.amount
-    if update.description is not None:
-        entry.description = update.description
-    entry.updated_at = datetime.now(timezone.utc)
-    entry.version += 1
-
-    await db.commit()
-    await db.refresh(entry)
-
     logger.info("Successfully updated entry_id=%s", entry_id)
 
     # Injecting USD -> CAD conversion into entry
-    usd_entry = await inject_cad_amount(entry)
-    return usd_entry
+    return build_entry_out(row, await get_usd_to_cad_rate())
 
 
 async def delete_entry(entry_id: str, db: AsyncSession) -> LedgerEntryDeletedResponse:
     """Soft-delete a ledger entry by marking it as deleted and reutrn confirmation metadata."""
     logger.info("Attempting to delete entry_id=%s", entry_id)
 
-    entry = await get_entry_or_raise_404(entry_id, db)
-
-    entry.is_deleted = True
-    entry.updated_at = datetime.now(timezone.utc)
-    entry.version += 1
-
-    await db.commit()
-    await db.refresh(entry)
+    # One atomic statement instead of SELECT, modify, flush and refresh
+    stmt = (
+        sql_update(DBLedgerEntry)
+        .where(DBLedgerEntry.id == entry_id, DBLedgerEntry.is_deleted.is_(False))
+        .values(
+            is_deleted=True,
+            updated_at=func.now(),
+            version=DBLedgerEntry.version + 1,
+        )
+        .returning(DBLedgerEntry.id, DBLedgerEntry.is_deleted, DBLedgerEntry.version)
+        .execution_options(synchronize_session=False)
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Ledger entry not found")
 
     logger.info("Successfully soft-deleted entry_id=%s", entry_id)
-    return LedgerEntryDeletedResponse.model_validate(entry)
+    return LedgerEntryDeletedResponse.model_construct(
+        id=row.id, is_deleted=row.is_deleted, version=row.version
+    )
 
 
 async def list_entries(
     db: AsyncSession,
     account_name: str | None = None,
     currency: str | None = None,
-    entry_type: str | None = None,
-    start_date: str | None = None,
-    end_date: str | None = None,
+    entry_type: EntryType | None = None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
     limit: int = 100,
     offset: int = 0,
 ) -> LedgerEntryListResponse:
     """Retrieve all ledger entries with optional filters."""
-    stmt = (
-        select(DBLedgerEntry)
-        .options(selectinload(DBLedgerEntry.account))
-        .where(DBLedgerEntry.is_deleted.is_(False))
-    )
-
+    # Each optional filter is its own lambda, so every combination of filters
+    # gets one cached compiled statement and only the bound values vary.
+    criteria = []
     # Case insensitive filtering
     if account_name:
-        stmt = stmt.join(DBAccount).where(
-            func.lower(DBAccount.name) == account_name.lower()
+        name = account_name.lower()
+        criteria.append(
+            lambda s: s.where(func.lower(DBLedgerEntry.account_name) == name)
         )
     if currency:
-        stmt = stmt.where(DBLedgerEntry.currency == currency.upper())
+        code = currency.upper()
+        criteria.append(lambda s: s.where(DBLedgerEntry.currency == code))
     if entry_type:
-        stmt = stmt.where(DBLedgerEntry.entry_type == EntryType(entry_type))
-    try:
-        if start_date:
-            stmt = stmt.where(DBLedgerEntry.date >= datetime.fromisoformat(start_date))
-        if end_date:
-            stmt = stmt.where(DBLedgerEntry.date <= datetime.fromisoformat(end_date))
-    except ValueError as e:
-        capture_message(f"{e}", level="warning")
-        raise HTTPException(status_code=400, detail="Invalid date format")
-
-    # Get total count before applying offset/limit
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await db.execute(count_stmt)).scalar_one()
-
-    # Apply pagination
-    stmt = stmt.order_by(DBLedgerEntry.date.desc()).offset(offset).limit(limit)
-    results = (await db.execute(stmt)).scalars().all()
-
-    # Fetch USD -> CAD exchange rate
-    usd_to_cad = await get_usd_to_cad_rate()
-
-    # Inject canadian_amount in each response object
-    entries: List[LedgerEntryOut] = []
-    for e in results:
-        validated = LedgerEntryOut.model_validate(e)
-        validated.canadian_amount = round(validated.amount * Decimal(usd_to_cad), 2)
-        entries.append(validated)
+        criteria.append(lambda s: s.where(DBLedgerEntry.entry_type == entry_type))
+    if start_date:
+        criteria.append(lambda s: s.where(DBLedgerEntry.date >= start_date))
+    if end_date:
+        criteria.append(lambda s: s.where(DBLedgerEntry.date <= end_date))
+
+    # Project plain columns instead of ORM rows: no identity-map inserts or
+    # instrumented attribute reads, just the fields LedgerEntryOut needs.
+    # COUNT(*) OVER () is evaluated before LIMIT/OFFSET, so every row carries
+    # the filtered total and no separate count query is needed.
+    if currency and currency.upper() != "USD":
+        # The rate only converts USD, so a non-USD page needs no Treasury call
+        page_stmt = lambda_stmt(
+            lambda: select(
+                *_LIST_COLUMNS,
+                null().label("canadian_amount"),
+                func.count().over().label("total_count"),
+            ).where(DBLedgerEntry.is_deleted.is_(False))
+        )
+    else:
+        # Fetch USD -> CAD exchange rate
+        usd_to_cad = await get_usd_to_cad_rate()
+        page_stmt = lambda_stmt(
+            lambda: select(
+                *_LIST_COLUMNS,
+                _cad_amount_column(usd_to_cad),
+                func.count().over().label("total_count"),
+            ).where(DBLedgerEntry.is_deleted.is_(False))
+        )
+    for criterion in criteria:
+        page_stmt += criterion
+    page_stmt += lambda s: s.order_by(DBLedgerEntry.date.desc())
+    page_stmt += lambda s: s.offset(offset).limit(limit)
+    results = (await db.execute(page_stmt)).all()
+
+    if results:
+        # total_count is the last selected column
+        total = results[0][-1]
+    elif offset:
+        # Page past the end: no row to read the total from
+        count_stmt = lambda_stmt(
+            lambda: select(func.count())
+            .select_from(DBLedgerEntry)
+            .where(DBLedgerEntry.is_deleted.is_(False))
+        )
+        for criterion in criteria:
+            count_stmt += criterion
+        total = (await db.execute(count_stmt)).scalar_one()
+    else:
+        total = 0
+
+    # canadian_amount was computed by the database; map() sizes the list from
+    # the row count and keeps the per-row loop in C
+    entries: List[LedgerEntryOut] = list(map(entry_out_from_row, results))
     return LedgerEntryListResponse(
         total=total, limit=limit, offset=offset, entries=entries
     )
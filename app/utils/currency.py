@@ -7,10 +7,16 @@ Description: Utility function for fetching the latest available USD -> CAD excha
              rate from the Treasury API.
 """
 
+import asyncio
+import logging
+import time
+
 import httpx
+import orjson
 from datetime import date
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 
+logger = logging.getLogger(__name__)
 
 TREASURY_URL = (
     "https://api.fiscaldata.treasury.gov/services/api/fiscal_service/v1/accounting/od/"
@@ -19,16 +25,64 @@ TREASURY_URL = (
     "&sort=-record_date&page[size]=1"
 )
 
+# Treasury publishes rates quarterly, so an hour-old value is never stale
+RATE_CACHE_TTL = 3600.0
+
+_rate_cache: tuple[Decimal, float] | None = None  # (rate, expires_at monotonic)
+_rate_lock = asyncio.Lock()
+
+# One keep-alive client for the process, so refreshes skip the TCP/TLS handshake
+_client = httpx.AsyncClient(
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=4),
+)
+
 
-async def get_usd_to_cad_rate() -> float:
+async def _fetch_usd_to_cad_rate() -> Decimal:
     """Fetch latest available USD → CAD exchange rate from the Treasury API."""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(TREASURY_URL)
-        response.raise_for_status()
-        data = response.json()
+    response = await _client.get(TREASURY_URL)
+    response.raise_for_status()
+    data = orjson.loads(response.content)
 
     try:
         rate_str = data["data"][0]["exchange_rate"]
-        return float(rate_str)
-    except (KeyError, IndexError, ValueError):
+        # Parsed straight to Decimal: exact, and callers need no conversion
+        return Decimal(rate_str)
+    except (KeyError, IndexError, TypeError, InvalidOperation):
         raise RuntimeError("Failed to parse exchange rate for Canada-Dollar")
+
+
+async def get_usd_to_cad_rate() -> Decimal:
+    """Return the USD → CAD rate, refreshing it from Treasury at most once per TTL."""
+    global _rate_cache
+    cached = _rate_cache
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
+    # Concurrent misses wait on one fetch instead of each calling Treasury
+    async with _rate_lock:
+        cached = _rate_cache
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        rate = await _fetch_usd_to_cad_rate()
+        _rate_cache = (rate, time.monotonic() + RATE_CACHE_TTL)
+        return rate
+
+
+async def warm_rate_cache() -> None:
+    """Fetch the rate ahead of the first request; failures are retried lazily."""
+    try:
+        await get_usd_to_cad_rate()
+    except Exception:
+        logger.warning("Could not prefetch USD -> CAD rate", exc_info=True)
+
+
+def clear_rate_cache() -> None:
+    """Drop the cached rate so the next call fetches a fresh one."""
+    global _rate_cache
+    _rate_cache = None
+
+
+async def close_http_client() -> None:
+    """Close the shared Treasury client; called on application shutdown."""
+    await _client.aclose()
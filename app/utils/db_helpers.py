@@ -8,24 +8,29 @@ Description: Shared database utility functions for fetching and validating
              used across service layers.
 """
 
+import time
 from decimal import Decimal
 from uuid import UUID
 from fastapi import HTTPException
 
-from sqlalchemy import select, func
+from sqlalchemy import exists, func, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.db.models.ledger_entry_model import DBLedgerEntry
+from app.db.models.ledger_entry_model import DBLedgerEntry, EntryType
 from app.db.models.account_model import DBAccount
 
+# Active account name -> (id, expires_at). The short TTL bounds how long a
+# worker keeps accepting entries for an account renamed or deactivated elsewhere.
+ACCOUNT_CACHE_TTL = 30.0
+_active_account_ids: dict[str, tuple[UUID, float]] = {}
+
 
 async def get_entry_or_raise_404(entry_id: str, db: AsyncSession) -> DBLedgerEntry:
     """Fetch a ledger entry or raise 404 if not found or deleted."""
-    stmt = (
-        select(DBLedgerEntry)
-        .options(selectinload(DBLedgerEntry.account))
-        .where(DBLedgerEntry.id == entry_id, DBLedgerEntry.is_deleted.is_(False))
+    stmt = lambda_stmt(
+        lambda: select(DBLedgerEntry).where(
+            DBLedgerEntry.id == entry_id, DBLedgerEntry.is_deleted.is_(False)
+        )
     )
     result = await db.execute(stmt)
     entry = result.scalar_one_or_none()
@@ -34,27 +39,34 @@ async def get_entry_or_raise_404(entry_id: str, db: AsyncSession) -> DBLedgerEnt
     return entry
 
 
-async def get_debit_credit_totals(db: AsyncSession) -> list[tuple[str, int, Decimal]]:
-    """Return counts and totals grouped by entry type."""
-    stmt = (
-        select(
-            DBLedgerEntry.entry_type,
-            func.count().label("count"),
-            func.coalesce(func.sum(DBLedgerEntry.amount), Decimal("0.00")).label(
-                "total"
-            ),
-        )
-        .where(DBLedgerEntry.is_deleted.is_(False))
-        .group_by(DBLedgerEntry.entry_type)
-    )
-    result = await db.execute(stmt)
-    return result.all()
+# Parameterless, so built once at import and reused from the compiled cache
+_IS_DEBIT = DBLedgerEntry.entry_type == EntryType.debit
+_IS_CREDIT = DBLedgerEntry.entry_type == EntryType.credit
+# The fallback is in cents like the column: a NUMERIC 0.00 would come back
+# through Cents as 0.0000
+_TOTAL_DEBITS = func.coalesce(func.sum(DBLedgerEntry.amount).filter(_IS_DEBIT), 0)
+_TOTAL_CREDITS = func.coalesce(func.sum(DBLedgerEntry.amount).filter(_IS_CREDIT), 0)
+_DEBIT_CREDIT_TOTALS = select(
+    func.count().filter(_IS_DEBIT).label("num_debits"),
+    _TOTAL_DEBITS.label("total_debit_amount"),
+    func.count().filter(_IS_CREDIT).label("num_credits"),
+    _TOTAL_CREDITS.label("total_credit_amount"),
+    (_TOTAL_DEBITS == _TOTAL_CREDITS).label("is_balanced"),
+).where(DBLedgerEntry.is_deleted.is_(False))
+
+
+async def get_debit_credit_totals(
+    db: AsyncSession,
+) -> tuple[int, Decimal, int, Decimal, bool]:
+    """Return debit/credit counts and totals plus is_balanced in one scan."""
+    result = await db.execute(_DEBIT_CREDIT_TOTALS)
+    return tuple(result.one())
 
 
 async def get_account_or_raise_404(account_id: UUID, db: AsyncSession) -> DBAccount:
     """Fetch an account by ID or raise 404 if not found."""
-    result = await db.execute(select(DBAccount).where(DBAccount.id == account_id))
-    account = result.scalar_one_or_none()
+    # Primary-key get() is served from the identity map when already loaded
+    account = await db.get(DBAccount, account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     return account
@@ -62,22 +74,51 @@ async def get_account_or_raise_404(account_id: UUID, db: AsyncSession) -> DBAcco
 
 async def account_name_exists(name: str, db: AsyncSession) -> bool:
     """Check if an account name already exists."""
-    result = await db.execute(select(DBAccount).where(DBAccount.name == name))
-    return result.scalar_one_or_none() is not None
+    # EXISTS returns one boolean instead of a full account row
+    stmt = lambda_stmt(lambda: select(exists().where(DBAccount.name == name)))
+    result = await db.execute(stmt)
+    return bool(result.scalar())
 
 
 async def get_active_account_by_name(name: str, db: AsyncSession) -> DBAccount:
     """Fetch an active account by name or raise 404."""
-    result = await db.execute(
-        select(DBAccount).where(DBAccount.name == name, DBAccount.is_active.is_(True))
+    stmt = lambda_stmt(
+        lambda: select(DBAccount).where(
+            DBAccount.name == name, DBAccount.is_active.is_(True)
+        )
     )
+    result = await db.execute(stmt)
     account = result.scalar_one_or_none()
     if not account:
         raise HTTPException(status_code=404, detail="Account not found or inactive")
     return account
 
 
+async def get_active_account_id(name: str, db: AsyncSession) -> UUID:
+    """Resolve an active account name to its id, caching hits for a short TTL."""
+    cached = _active_account_ids.get(name)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+    # Only the id is needed, so skip loading and identity-mapping the account
+    stmt = lambda_stmt(
+        lambda: select(DBAccount.id).where(
+            DBAccount.name == name, DBAccount.is_active.is_(True)
+        )
+    )
+    account_id = (await db.execute(stmt)).scalar_one_or_none()
+    if account_id is None:
+        raise HTTPException(status_code=404, detail="Account not found or inactive")
+    _active_account_ids[name] = (account_id, time.monotonic() + ACCOUNT_CACHE_TTL)
+    return account_id
+
+
+def clear_account_cache() -> None:
+    """Forget cached account ids, e.g. after an account is renamed or deactivated."""
+    _active_account_ids.clear()
+
+
 async def get_account_by_name(name: str, db: AsyncSession) -> DBAccount | None:
     """Fetch any account by name regardless of is_active status."""
-    result = await db.execute(select(DBAccount).where(DBAccount.name == name))
+    stmt = lambda_stmt(lambda: select(DBAccount).where(DBAccount.name == name))
+    result = await db.execute(stmt)
     return result.scalar_one_or_none()
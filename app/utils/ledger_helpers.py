@@ -9,19 +9,95 @@ Description: Helper functions related to ledger logic, including CAD conversion
 """
 
 from decimal import Decimal
+from typing import Any, Mapping, Sequence
+
 from app.utils.currency import get_usd_to_cad_rate
 from app.schemas.ledger_entry_schema import LedgerEntryOut, EntryType
-from app.db.models.ledger_entry_model import DBLedgerEntry
+from app.db.models.ledger_entry_model import DBLedgerEntry, to_cents
+from app.db.models.ledger_entry_model import EntryType as DBEntryType
+
+# Rates are applied as integer micro-units; Treasury quotes at most 4 decimals
+RATE_SCALE = 1_000_000
+
+# Maps DB enum members and raw strings to the schema's str enum with one dict
+# lookup; the ORM enum is a different class from the schema's EntryType
+ENTRY_TYPE_MAP = {
+    **{member.value: member for member in EntryType},
+    **{member: EntryType(member.value) for member in DBEntryType},
+}
+
+# DB-backed fields of LedgerEntryOut, copied as-is from a row or ORM object
+ENTRY_OUT_FIELDS = (
+    "id",
+    "account_id",
+    "account_name",
+    "date",
+    "entry_type",
+    "amount",
+    "currency",
+    "description",
+    "idempotency_key",
+    "created_at",
+    "updated_at",
+    "is_deleted",
+    "version",
+)
+
+# Positional layout of a listing row: the DB fields, then the SQL CAD amount
+ENTRY_OUT_ROW_FIELDS = ENTRY_OUT_FIELDS + ("canadian_amount",)
+
+
+def to_cad_amount(amount: Decimal, rate: Decimal) -> Decimal:
+    """Convert USD to CAD in integer cents, rounding half up like SQL ROUND()."""
+    cents = to_cents(amount)
+    rate_micro = int(rate.scaleb(6))
+    cad_cents = (cents * rate_micro + RATE_SCALE // 2) // RATE_SCALE
+    return Decimal(cad_cents).scaleb(-2)
+
+
+def build_entry_out(
+    fields: Mapping[str, Any], cad_rate: Decimal | None = None
+) -> LedgerEntryOut:
+    """Build a LedgerEntryOut from trusted DB values without re-validating them."""
+    values = {name: fields[name] for name in ENTRY_OUT_FIELDS}
+    values["entry_type"] = ENTRY_TYPE_MAP[values["entry_type"]]
+    if cad_rate is not None:
+        values["canadian_amount"] = to_cad_amount(values["amount"], cad_rate)
+    elif "canadian_amount" in fields:
+        # Already computed, e.g. by the listing query
+        values["canadian_amount"] = fields["canadian_amount"]
+    return LedgerEntryOut.model_construct(**values)
+
+
+def entry_out_from_row(row: Sequence[Any]) -> LedgerEntryOut:
+    """Build a LedgerEntryOut from a positional row laid out as ENTRY_OUT_ROW_FIELDS.
+
+    Trailing columns beyond the layout are ignored.
+    """
+    values = dict(zip(ENTRY_OUT_ROW_FIELDS, row))
+    values["entry_type"] = ENTRY_TYPE_MAP[values["entry_type"]]
+    return LedgerEntryOut.model_construct(**values)
+
+
+def entry_to_out(
+    entry: DBLedgerEntry, cad_rate: Decimal | None = None
+) -> LedgerEntryOut:
+    """Build a LedgerEntryOut from a loaded ORM entry."""
+    return build_entry_out(
+        {name: getattr(entry, name) for name in ENTRY_OUT_FIELDS}, cad_rate
+    )
 
 
 async def inject_cad_amount(entry: DBLedgerEntry) -> LedgerEntryOut:
-    """Add a computed CAD amount to a validated ledger entry."""
-    validated = LedgerEntryOut.model_validate(entry)
-    usd_to_cad = await get_usd_to_cad_rate()
-    validated.canadian_amount = round(validated.amount * Decimal(usd_to_cad), 2)
-    return validated
+    """Add a computed CAD amount to a ledger entry response."""
+    return entry_to_out(entry, await get_usd_to_cad_rate())
+
+
+# Same keys as ENTRY_TYPE_MAP, resolved to the plain string value
+_ENTRY_TYPE_VALUES = {key: member.value for key, member in ENTRY_TYPE_MAP.items()}
 
 
-def normalize_entry_type(value: str | EntryType) -> str:
+def normalize_entry_type(value: str | EntryType | DBEntryType) -> str:
     """Ensure consistent string value for entry_type."""
-    return getattr(value, "value", value)
+    # One dict probe for either enum or a raw string; unknown strings pass through
+    return _ENTRY_TYPE_VALUES.get(value, value)
@@ -13,25 +13,37 @@ import logging.config
 from typing import Optional
 
 
-def setup_logging(level: Optional[str] = "INFO") -> None:
-    logging_config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "default": {
-                "format": "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
-            },
-        },
-        "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "formatter": "default",
-            },
+# Built once at import; setup_logging only fills in the root level
+_LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {
+            "format": "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
         },
-        "root": {
-            "handlers": ["console"],
-            "level": level,
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "default",
         },
-    }
+    },
+    "root": {
+        "handlers": ["console"],
+        "level": "INFO",
+    },
+}
+
+_configured = False
+
+
+def setup_logging(level: Optional[str] = "INFO") -> None:
+    global _configured
+    if _configured:
+        # Handlers are already installed; only the level can change
+        logging.getLogger().setLevel(level)
+        return
 
-    logging.config.dictConfig(logging_config)
+    _LOGGING_CONFIG["root"]["level"] = level
+    logging.config.dictConfig(_LOGGING_CONFIG)
+    _configured = True
@@ -1,12 +1,13 @@
 import asyncio
-import uuid
+import secrets
 import sys
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
-from sqlalchemy import text
+from sqlalchemy import insert, text
 
 from app.db.session import async_session_factory
 from app.db.models import DBAccount, DBLedgerEntry
+from app.db.models.ledger_entry_model import idempotency_fingerprint
 from app.schemas.ledger_entry_schema import EntryType
 
 
@@ -20,74 +21,80 @@ async def seed(reset: bool = False):
             await session.commit()
             session.expunge_all()
 
-        # Create sample accounts
-        accounts = [
-            DBAccount(name="Cash", is_active=True),
-            DBAccount(name="Bank", is_active=True),
-            DBAccount(name="Accounts Receivable", is_active=True),
-            DBAccount(name="Accounts Payable", is_active=True),
-            DBAccount(name="Sales Revenue", is_active=True),
-            DBAccount(name="Service Revenue", is_active=True),
-            DBAccount(name="Rent Expense", is_active=True),
-            DBAccount(name="Utilities Expense", is_active=True),
-            DBAccount(name="Salaries Expense", is_active=True),
-            DBAccount(name="Office Supplies", is_active=True),
-            DBAccount(name="Equipment", is_active=True),
-            DBAccount(
-                name="Suspense", is_active=False
-            ),  # Inactive account for edge case testing
+        # Create sample accounts in one multi-row INSERT ... RETURNING
+        account_rows = [
+            {"name": "Cash", "is_active": True},
+            {"name": "Bank", "is_active": True},
+            {"name": "Accounts Receivable", "is_active": True},
+            {"name": "Accounts Payable", "is_active": True},
+            {"name": "Sales Revenue", "is_active": True},
+            {"name": "Service Revenue", "is_active": True},
+            {"name": "Rent Expense", "is_active": True},
+            {"name": "Utilities Expense", "is_active": True},
+            {"name": "Salaries Expense", "is_active": True},
+            {"name": "Office Supplies", "is_active": True},
+            {"name": "Equipment", "is_active": True},
+            {
+                "name": "Suspense",
+                "is_active": False,
+            },  # Inactive account for edge case testing
         ]
 
-        session.add_all(accounts)
-        await session.flush()  # Ensures accounts get IDs
+        result = await session.execute(
+            insert(DBAccount)
+            .values(account_rows)
+            .returning(DBAccount.id, DBAccount.name)
+        )
 
         # Build account_id lookup
-        account_lookup = {acc.name: acc.id for acc in accounts}
+        account_lookup = {name: account_id for account_id, name in result}
 
         # Create sample ledger entries
         now = datetime.now(timezone.utc)
-        entries = [
-            DBLedgerEntry(
-                account_id=account_lookup["Cash"],
-                date=now,
-                entry_type=EntryType.debit,
-                amount=Decimal("5000.00"),
-                currency="USD",
-                description="Invoice #123",
-                idempotency_key=str(uuid.uuid4()),
-            ),
-            DBLedgerEntry(
-                account_id=account_lookup["Sales Revenue"],
-                date=now,
-                entry_type=EntryType.credit,
-                amount=Decimal("5000.00"),
-                currency="USD",
-                description="Invoice #123 revenue",
-                idempotency_key=str(uuid.uuid4()),
-            ),
-            DBLedgerEntry(
-                account_id=account_lookup["Accounts Receivable"],
-                date=now - timedelta(days=2),
-                entry_type=EntryType.debit,
-                amount=Decimal("1000.00"),
-                currency="USD",
-                description="Client deposit",
-                idempotency_key=str(uuid.uuid4()),
-            ),
-            DBLedgerEntry(
-                account_id=account_lookup["Cash"],
-                date=now - timedelta(days=2),
-                entry_type=EntryType.credit,
-                amount=Decimal("1000.00"),
-                currency="USD",
-                description="Offset to cash",
-                idempotency_key=str(uuid.uuid4()),
-            ),
+        entry_rows = [
+            {
+                "account_name": "Cash",
+                "date": now,
+                "entry_type": EntryType.debit,
+                "amount": Decimal("5000.00"),
+                "description": "Invoice #123",
+            },
+            {
+                "account_name": "Sales Revenue",
+                "date": now,
+                "entry_type": EntryType.credit,
+                "amount": Decimal("5000.00"),
+                "description": "Invoice #123 revenue",
+            },
+            {
+                "account_name": "Accounts Receivable",
+                "date": now - timedelta(days=2),
+                "entry_type": EntryType.debit,
+                "amount": Decimal("1000.00"),
+                "description": "Client deposit",
+            },
+            {
+                "account_name": "Cash",
+                "date": now - timedelta(days=2),
+                "entry_type": EntryType.credit,
+                "amount": Decimal("1000.00"),
+                "description": "Offset to cash",
+            },
         ]
+        for row in entry_rows:
+            key = secrets.token_hex(16)
+            row.update(
+                account_id=account_lookup[row["account_name"]],
+                currency="USD",
+                idempotency_key=key,
+                idempotency_fp=idempotency_fingerprint(key),
+            )
 
-        session.add_all(entries)
+        await session.execute(insert(DBLedgerEntry).values(entry_rows))
         await session.commit()
-        print(f"Seeded {len(accounts)} accounts and {len(entries)} ledger entries.")
+        print(
+            f"Seeded {len(account_rows)} accounts and {len(entry_rows)} ledger entries."
+        )
 
 
 if __name__ == "__main__":
@@ -1,68 +1,130 @@
 # tests/conftest.py
 
+import asyncio
+import itertools
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import AsyncMock
-from sqlalchemy.ext.asyncio import AsyncSession
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 from decimal import Decimal
-from datetime import datetime
-from app.db.models.ledger_entry_model import DBLedgerEntry
-from app.schemas.ledger_entry_schema import LedgerEntryOut
+from datetime import datetime, timezone
+from app.db.models import DBAccount
+from app.db.models.ledger_entry_model import DBLedgerEntry, EntryType
+from app.utils.db_helpers import clear_account_cache
+
+# Load the service layer once up front so the first test doesn't pay for it
+import app.services.account_service  # noqa: F401
+import app.services.entry_service  # noqa: F401
+import app.services.summary_service  # noqa: F401
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session loop instead of one loop per test."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run the shared test loop on uvloop where it is installed (not on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+class FakeSession:
+    """The slice of AsyncSession the services touch, without a spec'd AsyncMock."""
+
+    def __init__(self):
+        self.execute = AsyncMock()
+        self.get = AsyncMock()
+        self.flush = AsyncMock()
+        self.commit = AsyncMock()
+        self.refresh = AsyncMock()
+        self.add = MagicMock()
+
+
+def result_stub(**returns) -> SimpleNamespace:
+    """Stub a SQLAlchemy Result whose named methods return the given values."""
+    return SimpleNamespace(
+        **{name: (lambda value=value: value) for name, value in returns.items()}
+    )
+
+
+def execute_seq(*results):
+    """Fake db.execute returning each result in turn, with no call recording."""
+    it = iter(results)
+
+    async def _execute(*args, **kwargs):
+        return next(it)
+
+    return _execute
 
 
 @pytest.fixture
 def async_mock_db():
-    """Returns a fresh AsyncMock() DB session per test."""
-    db = AsyncMock(spec=AsyncSession)
-    db.commit = AsyncMock()
-    db.refresh = AsyncMock()
-    db.execute = AsyncMock()
-    db.add = AsyncMock()
-    return db
-
-
-def make_mock_entry_out(
-    entry: DBLedgerEntry,
-    account_name: str,
-    *,
-    override_amount: Decimal | None = None,
-    override_description: str | None = None,
-    override_version: int | None = None,
-    override_canadian_amount: Decimal | None = None,
-) -> LedgerEntryOut:
-    """
-    Create a fully valid LedgerEntryOut object from a DBLedgerEntry instance,
-    with optional overrides for amount, description, version, or CAD amount.
-    """
-    return LedgerEntryOut(
-        id=entry.id,
-        account_id=entry.account_id,
-        idempotency_key=entry.idempotency_key,
-        account_name=account_name,
-        amount=override_amount if override_amount is not None else entry.amount,
-        currency=entry.currency,
-        description=(
-            override_description
-            if override_description is not None
-            else entry.description
-        ),
-        date=entry.date,
-        entry_type=entry.entry_type,
-        created_at=entry.created_at,
-        updated_at=entry.updated_at,
-        version=override_version if override_version is not None else entry.version + 1,
-        is_deleted=False,
-        canadian_amount=(
-            override_canadian_amount
-            if override_canadian_amount is not None
-            else Decimal("135.00")
-        ),
-    )
+    """Returns a fresh FakeSession per test."""
+    return FakeSession()
+
+
+# Fixed timestamp for mocked rows; nothing under test compares it to the clock
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_DEFAULT_AMOUNT = Decimal("100.00")
+
+_uuid_counter = itertools.count(1)
+
+
+def fast_uuid() -> UUID:
+    """Return a unique UUID without touching os.urandom; fine for mocked tests."""
+    return UUID(int=next(_uuid_counter))
+
+
+@pytest.fixture(scope="session")
+def sample_account():
+    """An active "Cash" account shared read-only by every test; do not mutate."""
+    return DBAccount(id=fast_uuid(), name="Cash", is_active=True)
+
+
+def make_entry(account: DBAccount, **overrides) -> DBLedgerEntry:
+    """Build an active USD debit entry on `account`; any column can be overridden."""
+    fields = {
+        "id": fast_uuid(),
+        "account_id": account.id,
+        "account_name": account.name,
+        "entry_type": EntryType.debit,
+        "amount": _DEFAULT_AMOUNT,
+        "currency": "USD",
+        "description": "Test entry",
+        "idempotency_key": str(fast_uuid()),
+        "date": NOW,
+        "created_at": NOW,
+        "updated_at": NOW,
+        "is_deleted": False,
+        "version": 1,
+    }
+    fields.update(overrides)
+    # Only ids are set, not the relationship, so shared accounts stay untouched
+    return DBLedgerEntry(**fields)
 
 
 @pytest.fixture(autouse=True)
 def patch_exchange_rate(monkeypatch):
     async def fake_rate():
-        return 1.35
+        return Decimal("1.35")
 
     monkeypatch.setattr("app.utils.currency.get_usd_to_cad_rate", fake_rate)
+
+
+@pytest.fixture(autouse=True)
+def fresh_account_cache():
+    """Keep cached account ids from leaking between tests."""
+    clear_account_cache()
+    yield
+    clear_account_cache()
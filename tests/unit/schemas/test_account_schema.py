@@ -1,6 +1,6 @@
 import pytest
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from pydantic import ValidationError
 
 from app.schemas.account_schema import (
@@ -8,6 +8,7 @@ from app.schemas.account_schema import (
     AccountUpdate,
     AccountOut,
 )
+from tests.conftest import NOW, fast_uuid
 
 
 def test_valid_account_create():
@@ -42,10 +43,10 @@ def test_account_update_partial_is_active_only():
 
 def test_account_out_success():
     out = AccountOut(
-        id=uuid.uuid4(),
+        id=fast_uuid(),
         name="Assets",
         is_active=True,
-        created_at=datetime.now(timezone.utc),
+        created_at=NOW,
     )
     assert out.name == "Assets"
     assert isinstance(out.id, uuid.UUID)
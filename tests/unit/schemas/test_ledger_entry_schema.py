@@ -1,10 +1,13 @@
 import pytest
-import uuid
 from decimal import Decimal
-from datetime import datetime, timezone
 from pydantic import ValidationError
 
-from app.schemas.ledger_entry_schema import LedgerEntryCreate, EntryType
+from app.schemas.ledger_entry_schema import (
+    LedgerEntryCreate,
+    LedgerEntryOut,
+    EntryType,
+)
+from tests.conftest import NOW, fast_uuid
 
 
 def test_valid_ledger_entry_create():
@@ -14,8 +17,8 @@ def test_valid_ledger_entry_create():
         amount=Decimal("100.00"),
         currency="USD",
         description="Valid entry",
-        date=datetime.now(timezone.utc),
-        idempotency_key=str(uuid.uuid4()),
+        date=NOW,
+        idempotency_key=str(fast_uuid()),
     )
     assert entry.account_name == "Cash"
     assert entry.entry_type == EntryType.debit
@@ -31,8 +34,8 @@ def test_invalid_entry_type():
             amount=Decimal("100.00"),
             currency="USD",
             description="Invalid type",
-            date=datetime.now(timezone.utc),
-            idempotency_key=uuid.uuid4(),
+            date=NOW,
+            idempotency_key=fast_uuid(),
         )
     assert "entry_type" in str(exc.value)
 
@@ -45,8 +48,8 @@ def test_negative_amount():
             amount=Decimal("-20.00"),  # Invalid negative
             currency="USD",
             description="Invalid amount",
-            date=datetime.now(timezone.utc),
-            idempotency_key=uuid.uuid4(),
+            date=NOW,
+            idempotency_key=fast_uuid(),
         )
     assert "amount" in str(exc.value)
 
@@ -59,8 +62,8 @@ def test_currency_too_short():
             amount=Decimal("10.00"),
             currency="US",  # Too short
             description=None,
-            date=datetime.now(timezone.utc),
-            idempotency_key=uuid.uuid4(),
+            date=NOW,
+            idempotency_key=fast_uuid(),
         )
     assert "currency" in str(exc.value)
 
@@ -73,8 +76,8 @@ def test_currency_too_long():
             amount=Decimal("50.00"),
             currency="USDX",  # Too long
             description=None,
-            date=datetime.now(timezone.utc),
-            idempotency_key=uuid.uuid4(),
+            date=NOW,
+            idempotency_key=fast_uuid(),
         )
     assert "currency" in str(exc.value)
 
@@ -87,7 +90,62 @@ def test_missing_idempotency_key():
             amount=Decimal("10.00"),
             currency="USD",
             description="No key",
-            date=datetime.now(timezone.utc),
+            date=NOW,
             # idempotency_key is missing
         )
     assert "idempotency_key" in str(exc.value)
+
+
+def test_unsupported_currency():
+    with pytest.raises(ValidationError) as exc:
+        LedgerEntryCreate(
+            account_name="Cash",
+            entry_type=EntryType.debit,
+            amount=Decimal("10.00"),
+            currency="EUR",  # Valid code, not supported yet
+            description=None,
+            idempotency_key=str(fast_uuid()),
+        )
+    assert "currency" in str(exc.value)
+
+
+def test_idempotency_key_is_stripped():
+    key = str(fast_uuid())
+    entry = LedgerEntryCreate(
+        account_name="Cash",
+        entry_type=EntryType.debit,
+        amount=Decimal("10.00"),
+        currency="USD",
+        idempotency_key=f"  {key} ",
+    )
+    assert entry.idempotency_key == key
+
+
+def test_idempotency_key_rejects_invalid_characters():
+    with pytest.raises(ValidationError) as exc:
+        LedgerEntryCreate(
+            account_name="Cash",
+            entry_type=EntryType.debit,
+            amount=Decimal("10.00"),
+            currency="USD",
+            idempotency_key="key with spaces",
+        )
+    assert "idempotency_key" in str(exc.value)
+
+
+def test_entry_out_accepts_stored_key_outside_input_format():
+    # Rows written before the key format was enforced must still serialize
+    entry = LedgerEntryOut(
+        id=fast_uuid(),
+        account_id=fast_uuid(),
+        account_name="Cash",
+        entry_type=EntryType.debit,
+        amount=Decimal("10.00"),
+        currency="USD",
+        idempotency_key="legacy key!",
+        created_at=NOW,
+        updated_at=NOW,
+        is_deleted=False,
+        version=1,
+    )
+    assert entry.idempotency_key == "legacy key!"
@@ -1,6 +1,4 @@
 import pytest
-import uuid
-from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from fastapi import HTTPException
@@ -12,33 +10,21 @@ from app.schemas.account_schema import (
 )
 from app.services.account_service import create_account, update_account
 from app.db.models import DBAccount
+from tests.conftest import NOW, execute_seq, fast_uuid, result_stub
 
 
-@pytest.mark.asyncio
 async def test_create_account_success(async_mock_db):
     account_data = AccountCreate(name="Legal Fees")
     mock_account = DBAccount(
-        id=uuid.uuid4(),
+        id=fast_uuid(),
         name="Legal Fees",
         is_active=True,
-        created_at=datetime.now(timezone.utc),
+        created_at=NOW,
     )
 
-    # Mock account existence check to return no existing account
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none = MagicMock(return_value=None)
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
-
-    async_mock_db.add = MagicMock()
-    async_mock_db.commit = AsyncMock()
-    async_mock_db.refresh = AsyncMock()
-
-    async_mock_db.refresh.side_effect = lambda obj: obj.__dict__.update(
-        {
-            "id": mock_account.id,
-            "is_active": True,
-            "created_at": mock_account.created_at,
-        }
+    async_mock_db.execute = execute_seq(
+        result_stub(scalar_one_or_none=None),  # no existing account by name
+        result_stub(scalar_one=mock_account),  # INSERT ... RETURNING row
     )
 
     result = await create_account(account_data, async_mock_db)
@@ -46,19 +32,20 @@ async def test_create_account_success(async_mock_db):
     assert isinstance(result, AccountOut)
     assert result.name == "Legal Fees"
     assert result.is_active is True
+    assert result.id == mock_account.id
+    async_mock_db.refresh.assert_not_called()
 
 
-@pytest.mark.asyncio
 async def test_create_account_duplicate_name(async_mock_db):
     account_data = AccountCreate(name="Cash")
 
     # Simulate existing account found
     mock_result = MagicMock()
     existing = DBAccount(
-        id=uuid.uuid4(),
+        id=fast_uuid(),
         name="Cash",
         is_active=True,
-        created_at=datetime.now(timezone.utc),
+        created_at=NOW,
     )
     mock_result.scalar_one_or_none.return_value = existing
     async_mock_db.execute = AsyncMock(return_value=mock_result)
@@ -74,21 +61,18 @@ async def test_create_account_duplicate_name(async_mock_db):
     "app.services.account_service.account_name_exists",
     return_value=False,
 )
-@pytest.mark.asyncio
 async def test_update_account_success(async_mock_db):
-    account_id = uuid.uuid4()
+    account_id = fast_uuid()
     existing_account = DBAccount(
         id=account_id,
         name="Old Name",
         is_active=True,
-        created_at=datetime.now(timezone.utc),
+        created_at=NOW,
     )
 
     update_data = AccountUpdate(name="New Name", is_active=False)
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none = MagicMock(return_value=existing_account)
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
+    async_mock_db.get = AsyncMock(return_value=existing_account)
     async_mock_db.commit = AsyncMock()
     async_mock_db.refresh = AsyncMock()
 
@@ -98,15 +82,16 @@ async def test_update_account_success(async_mock_db):
     assert result.is_active is False
     assert isinstance(result, AccountOut)
 
+    # Rename is propagated to the denormalized account_name on entries
+    statements = [str(c.args[0]) for c in async_mock_db.execute.await_args_list]
+    assert any(s.startswith("UPDATE ledger_entries") for s in statements)
+
 
-@pytest.mark.asyncio
 async def test_update_account_not_found(async_mock_db):
-    account_id = uuid.uuid4()
+    account_id = fast_uuid()
     update_data = AccountUpdate(name="New Name", is_active=True)
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none = MagicMock(return_value=None)
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
+    async_mock_db.get = AsyncMock(return_value=None)
 
     with pytest.raises(HTTPException) as exc:
         await update_account(account_id, update_data, async_mock_db)
@@ -118,27 +103,24 @@ async def test_update_account_not_found(async_mock_db):
 from app.services.account_service import list_active_accounts
 
 
-@pytest.mark.asyncio
 async def test_list_active_accounts(async_mock_db):
-    mock_accounts = [
-        DBAccount(
-            id=uuid.uuid4(),
-            name="Cash",
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
-        ),
-        DBAccount(
-            id=uuid.uuid4(),
-            name="Sales Revenue",
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
-        ),
+    mock_rows = [
+        {
+            "id": fast_uuid(),
+            "name": "Cash",
+            "is_active": True,
+            "created_at": NOW,
+        },
+        {
+            "id": fast_uuid(),
+            "name": "Sales Revenue",
+            "is_active": True,
+            "created_at": NOW,
+        },
     ]
 
     mock_result = MagicMock()
-    mock_result.scalars = MagicMock(
-        return_value=MagicMock(all=MagicMock(return_value=mock_accounts))
-    )
+    mock_result.mappings = MagicMock(return_value=iter(mock_rows))
     async_mock_db.execute = AsyncMock(return_value=mock_result)
 
     response = await list_active_accounts(async_mock_db)
@@ -147,3 +129,4 @@ async def test_list_active_accounts(async_mock_db):
     assert isinstance(response.accounts, list)
     assert len(response.accounts) == 2
     assert all(isinstance(a, AccountOut) for a in response.accounts)
+    assert response.accounts[1].name == "Sales Revenue"
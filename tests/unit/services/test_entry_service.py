@@ -1,9 +1,8 @@
 import pytest
 import uuid
-from datetime import datetime, timezone
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock, patch
-from tests.conftest import make_mock_entry_out
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 from fastapi import HTTPException
 from app.schemas.ledger_entry_schema import (
@@ -22,89 +21,132 @@ from app.services.entry_service import (
     list_entries,
 )
 from app.db.models import DBAccount, DBLedgerEntry
+from app.db.models.ledger_entry_model import EntryType as DBEntryType
+from app.utils import db_helpers
+from app.utils.ledger_helpers import ENTRY_OUT_ROW_FIELDS
+from tests.conftest import NOW, execute_seq, fast_uuid, make_entry, result_stub
+
+# Shared amounts; Decimal is immutable so one instance serves every test
+RATE = Decimal("1.35")
+D_10 = Decimal("10.00")
+D_50 = Decimal("50.00")
+D_100 = Decimal("100.00")
+D_135 = Decimal("135.00")
+D_200 = Decimal("200.00")
+D_500 = Decimal("500.00")
+
+
+def _list_row(fields: dict) -> tuple:
+    """Lay out a listing row positionally, as the page query selects it."""
+    return tuple(fields[name] for name in ENTRY_OUT_ROW_FIELDS) + (
+        fields["total_count"],
+    )
+
+
+def _inserted_row(entry: LedgerEntryCreate, account_id: uuid.UUID) -> dict:
+    return {
+        "id": fast_uuid(),
+        "account_id": account_id,
+        "account_name": entry.account_name,
+        "date": entry.date,
+        "entry_type": entry.entry_type,
+        "amount": entry.amount,
+        "currency": entry.currency,
+        "description": entry.description,
+        "idempotency_key": entry.idempotency_key,
+        "created_at": NOW,
+        "updated_at": NOW,
+        "is_deleted": False,
+        "version": 1,
+    }
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_create_entry_success(mock_inject, async_mock_db):
+def _insert_result(row: dict | None) -> SimpleNamespace:
+    return SimpleNamespace(mappings=lambda: result_stub(one_or_none=row))
+
+
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_create_entry_success(mock_rate, async_mock_db, sample_account):
     entry = LedgerEntryCreate(
         account_name="Cash",
         entry_type=EntryType.debit,
-        amount=Decimal("100.00"),
+        amount=D_100,
         currency="USD",
         description="Initial deposit",
-        date=datetime.now(timezone.utc),
-        idempotency_key=str(uuid.uuid4()),
+        date=NOW,
+        idempotency_key=str(fast_uuid()),
     )
 
     # Setup account lookup
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
-    account_result = MagicMock()
-    account_result.scalar_one_or_none.return_value = account
-
-    # Setup idempotency check = no duplicate
-    idempotency_result = MagicMock()
-    idempotency_result.scalar_one_or_none.return_value = None
-
-    async_mock_db.execute = AsyncMock(side_effect=[account_result, idempotency_result])
-
-    # Patch DB add to fully populate new entry for Pydantic validation
-    async_mock_db.add = MagicMock()
-
-    async def fake_refresh(obj):
-        obj.id = uuid.uuid4()
-        obj.created_at = datetime.now(timezone.utc)
-        obj.updated_at = datetime.now(timezone.utc)
-        obj.version = 1
-        obj.is_deleted = False
-        obj.account = account
-        obj.account_id = account.id
-        return obj
-
-    async_mock_db.refresh.side_effect = fake_refresh
-    async_mock_db.commit = AsyncMock()
-
-    # Fake DB entry to use for inject_cad_amount mock
-    fake_db_entry = DBLedgerEntry(
-        id=uuid.uuid4(),
-        account_id=account.id,
-        account=account,
-        entry_type=entry.entry_type,
-        amount=entry.amount,
-        currency=entry.currency,
-        description=entry.description,
-        date=entry.date,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        idempotency_key=entry.idempotency_key,
+    account_result = result_stub(scalar_one_or_none=sample_account.id)
+
+    # INSERT ... ON CONFLICT DO NOTHING RETURNING yields the new row
+    async_mock_db.execute = AsyncMock(
+        side_effect=[
+            account_result,
+            _insert_result(_inserted_row(entry, sample_account.id)),
+        ]
     )
-    mock_inject.return_value = make_mock_entry_out(fake_db_entry, account_name="Cash")
 
     result = await create_entry(entry, async_mock_db)
 
     assert isinstance(result, LedgerEntryOut)
     assert result.amount == entry.amount
     assert result.account_name == "Cash"
+    assert result.canadian_amount == D_135
+    assert async_mock_db.execute.await_count == 2
+    async_mock_db.add.assert_not_called()
+    # account_name is copied from the accounts row, not from the request
+    stmt = str(async_mock_db.execute.await_args.args[0])
+    assert "SELECT accounts.id, accounts.name," in stmt
+    assert "AND accounts.name = " in stmt
+    assert "accounts.is_active IS true" in stmt
+
+
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_create_entry_caches_account_lookup(
+    mock_rate, async_mock_db, sample_account
+):
+    account_result = result_stub(scalar_one_or_none=sample_account.id)
+
+    def make_entry():
+        return LedgerEntryCreate(
+            account_name="Cash",
+            entry_type=EntryType.credit,
+            amount=Decimal("5.00"),
+            currency="USD",
+            date=NOW,
+            idempotency_key=str(fast_uuid()),
+        )
+
+    first, second = make_entry(), make_entry()
+    async_mock_db.execute = AsyncMock(
+        side_effect=[
+            account_result,
+            _insert_result(_inserted_row(first, sample_account.id)),
+            _insert_result(_inserted_row(second, sample_account.id)),
+        ]
+    )
+
+    await create_entry(first, async_mock_db)
+    await create_entry(second, async_mock_db)
+
+    # Second create skips the account SELECT
+    assert async_mock_db.execute.await_count == 3
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
 async def test_create_entry_account_missing(async_mock_db):
     entry = LedgerEntryCreate(
         account_name="Unknown",
         entry_type=EntryType.credit,
-        amount=Decimal("50.00"),
+        amount=D_50,
         currency="USD",
         description="Ghost account",
-        date=datetime.now(timezone.utc),
-        idempotency_key=str(uuid.uuid4()),
+        date=NOW,
+        idempotency_key=str(fast_uuid()),
     )
 
-    result = MagicMock()
-    result.scalar_one_or_none.return_value = None
-    async_mock_db.execute = AsyncMock(return_value=result)
+    async_mock_db.execute = AsyncMock(return_value=result_stub(scalar_one_or_none=None))
 
     with pytest.raises(HTTPException) as exc:
         await create_entry(entry, async_mock_db)
@@ -113,11 +155,65 @@ async def test_create_entry_account_missing(async_mock_db):
     assert "Account not found" in exc.value.detail
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_create_entry_idempotent_conflict(async_mock_db):
-    key = str(uuid.uuid4())
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
+async def test_create_entry_account_deactivated_since_cached(
+    async_mock_db, sample_account
+):
+    entry = LedgerEntryCreate(
+        account_name="Cash",
+        entry_type=EntryType.debit,
+        amount=D_100,
+        currency="USD",
+        idempotency_key=str(fast_uuid()),
+    )
+    async_mock_db.execute = execute_seq(
+        result_stub(scalar_one_or_none=sample_account.id),  # id lookup, cached
+        _insert_result(None),  # INSERT ... SELECT finds no active account
+        result_stub(scalar_one_or_none=None),  # and no idempotency conflict
+        result_stub(scalar_one_or_none=None),  # fresh lookup: no active "Cash"
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await create_entry(entry, async_mock_db)
+
+    assert exc.value.status_code == 404
+    assert "Cash" not in db_helpers._active_account_ids
+
+
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_create_entry_retries_once_after_account_renamed(
+    mock_rate, async_mock_db, sample_account
+):
+    # The cached id now belongs to a renamed account; "Cash" is a new account
+    new_cash_id = fast_uuid()
+    entry = LedgerEntryCreate(
+        account_name="Cash",
+        entry_type=EntryType.debit,
+        amount=D_100,
+        currency="USD",
+        idempotency_key=str(fast_uuid()),
+    )
+    async_mock_db.execute = execute_seq(
+        result_stub(scalar_one_or_none=sample_account.id),  # stale id
+        _insert_result(None),  # name no longer matches, nothing inserted
+        result_stub(scalar_one_or_none=None),  # no idempotency conflict
+        result_stub(scalar_one_or_none=new_cash_id),  # fresh lookup
+        _insert_result(_inserted_row(entry, new_cash_id)),
+    )
+
+    result = await create_entry(entry, async_mock_db)
+
+    assert result.account_id == new_cash_id
+    assert db_helpers._active_account_ids["Cash"][0] == new_cash_id
+
+
+def _existing_entry(key: str, account: DBAccount, amount: Decimal) -> DBLedgerEntry:
+    return make_entry(
+        account, amount=amount, description="Old entry", idempotency_key=key
+    )
+
+
+async def test_create_entry_idempotent_conflict(async_mock_db, sample_account):
+    key = str(fast_uuid())
 
     entry = LedgerEntryCreate(
         account_name="Cash",
@@ -125,34 +221,21 @@ async def test_create_entry_idempotent_conflict(async_mock_db):
         amount=Decimal("999.99"),
         currency="USD",
         description="Conflict entry",
-        date=datetime.now(timezone.utc),
+        date=NOW,
         idempotency_key=key,
     )
 
     # Matching account
-    account_result = MagicMock()
-    account_result.scalar_one_or_none.return_value = account
+    account_result = result_stub(scalar_one_or_none=sample_account.id)
 
     # Existing entry with same key but different amount
-    existing = DBLedgerEntry(
-        id=uuid.uuid4(),
-        account_id=account.id,
-        entry_type=EntryType.debit,
-        amount=Decimal("10.00"),
-        currency="USD",
-        description="Old entry",
-        idempotency_key=key,
-        date=entry.date,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        account=account,
+    existing_result = result_stub(
+        scalar_one_or_none=_existing_entry(key, sample_account, D_10)
     )
-    existing_result = MagicMock()
-    existing_result.scalar_one_or_none.return_value = existing
 
-    async_mock_db.execute = AsyncMock(side_effect=[account_result, existing_result])
+    async_mock_db.execute = execute_seq(
+        account_result, _insert_result(None), existing_result
+    )
 
     with pytest.raises(HTTPException) as exc:
         await create_entry(entry, async_mock_db)
@@ -161,49 +244,74 @@ async def test_create_entry_idempotent_conflict(async_mock_db):
     assert "Idempotency key already used" in exc.value.detail
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_get_entry_by_id_success(mock_inject, async_mock_db):
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
-    entry_id = uuid.uuid4()
+async def test_create_entry_idempotent_replay_returns_existing(
+    async_mock_db, sample_account
+):
+    key = str(fast_uuid())
+    existing = _existing_entry(key, sample_account, D_10)
 
-    entry = DBLedgerEntry(
-        id=entry_id,
-        account_id=account.id,
+    entry = LedgerEntryCreate(
+        account_name="Cash",
         entry_type=EntryType.debit,
-        amount=Decimal("100.00"),
+        amount=D_10,
         currency="USD",
-        description="Valid entry",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        account=account,
+        description="Old entry",
+        idempotency_key=key,
     )
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none = MagicMock(return_value=entry)
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
+    account_result = result_stub(scalar_one_or_none=sample_account.id)
+    existing_result = result_stub(scalar_one_or_none=existing)
+
+    async_mock_db.execute = execute_seq(
+        account_result, _insert_result(None), existing_result
+    )
 
-    mock_inject.return_value = make_mock_entry_out(entry, account_name="Cash")
+    result = await create_entry(entry, async_mock_db)
+
+    assert result.id == existing.id
+    assert result.entry_type is EntryType.debit
+
+
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_get_entry_by_id_success(mock_rate, async_mock_db, sample_account):
+    entry_id = fast_uuid()
+
+    row = {
+        "id": entry_id,
+        "account_id": sample_account.id,
+        "account_name": sample_account.name,
+        "date": NOW,
+        "entry_type": DBEntryType.debit,
+        "amount": D_100,
+        "currency": "USD",
+        "description": "Valid entry",
+        "idempotency_key": str(fast_uuid()),
+        "created_at": NOW,
+        "updated_at": NOW,
+        "is_deleted": False,
+        "version": 1,
+        "canadian_amount": D_135,  # computed in SQL
+    }
+
+    mock_result = result_stub(first=tuple(row[name] for name in ENTRY_OUT_ROW_FIELDS))
+    async_mock_db.execute = AsyncMock(return_value=mock_result)
 
     response = await get_entry_by_id(str(entry_id), async_mock_db)
 
     assert isinstance(response, LedgerEntryOut)
-    assert response.id == entry.id
-    assert response.account_name == account.name
-    assert response.amount == Decimal("100.00")
+    assert response.id == entry_id
+    assert response.account_name == sample_account.name
+    assert response.amount == D_100
+    assert response.canadian_amount == D_135
+    assert async_mock_db.execute.await_count == 1
+    assert "AS canadian_amount" in str(async_mock_db.execute.await_args.args[0])
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_get_entry_by_id_not_found(async_mock_db):
-    entry_id = uuid.uuid4()
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_get_entry_by_id_not_found(mock_rate, async_mock_db):
+    entry_id = fast_uuid()
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none = MagicMock(return_value=None)
+    mock_result = result_stub(first=None)
     async_mock_db.execute = AsyncMock(return_value=mock_result)
 
     with pytest.raises(HTTPException) as exc:
@@ -213,31 +321,12 @@ async def test_get_entry_by_id_not_found(async_mock_db):
     assert "not found" in exc.value.detail.lower()
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_get_entry_by_id_soft_deleted(async_mock_db):
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
-    entry_id = uuid.uuid4()
-
-    entry = DBLedgerEntry(
-        id=entry_id,
-        account_id=account.id,
-        entry_type=EntryType.credit,
-        amount=Decimal("500.00"),
-        currency="USD",
-        description="Soft deleted entry",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=True,  # is_deleted is True, should not get entry
-        version=1,
-        account=account,
-    )
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_get_entry_by_id_soft_deleted(mock_rate, async_mock_db):
+    entry_id = fast_uuid()
 
-    mock_result = MagicMock()
-    # Simulating no entry returned
-    mock_result.scalar_one_or_none = MagicMock(return_value=None)
+    # The query filters out is_deleted rows, so a soft-deleted id returns nothing
+    mock_result = result_stub(first=None)
     async_mock_db.execute = AsyncMock(return_value=mock_result)
 
     with pytest.raises(HTTPException) as exc:
@@ -246,174 +335,101 @@ async def test_get_entry_by_id_soft_deleted(async_mock_db):
     assert exc.value.status_code == 404
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_update_entry_success_amount_and_description(mock_inject, async_mock_db):
-    entry_id = uuid.uuid4()
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
-
-    entry = DBLedgerEntry(
-        id=entry_id,
-        account_id=account.id,
-        entry_type=EntryType.debit,
-        amount=Decimal("100.00"),
-        currency="USD",
-        description="Old description",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        account=account,
-    )
-
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=entry)
-    async_mock_db.execute = AsyncMock(return_value=result)
-    async_mock_db.commit = AsyncMock()
-    async_mock_db.refresh = AsyncMock(side_effect=lambda e: e)
-
-    update = LedgerEntryUpdate(
-        amount=Decimal("200.00"),
-        description="Updated description",
-    )
-
-    mock_inject.return_value = make_mock_entry_out(
-        entry,
-        account.name,
-        override_amount=Decimal("200.00"),
-        override_description="Updated description",
-    )
+def _updated_row(**overrides) -> dict:
+    row = {
+        "id": fast_uuid(),
+        "account_id": fast_uuid(),
+        "account_name": "Cash",
+        "date": NOW,
+        "entry_type": DBEntryType.debit,
+        "amount": D_100,
+        "currency": "USD",
+        "description": "Old description",
+        "idempotency_key": str(fast_uuid()),
+        "created_at": NOW,
+        "updated_at": NOW,
+        "is_deleted": False,
+        "version": 2,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.parametrize(
+    "update, row_overrides, expected_cad",
+    [
+        pytest.param(
+            LedgerEntryUpdate(
+                amount=D_200, description="Updated description"
+            ),
+            {"amount": D_200, "description": "Updated description"},
+            Decimal("270.00"),
+            id="amount_and_description",
+        ),
+        pytest.param(
+            LedgerEntryUpdate(amount=None, description="New note only"),
+            {
+                "entry_type": DBEntryType.credit,
+                "amount": D_500,  # unchanged
+                "description": "New note only",
+            },
+            Decimal("675.00"),
+            id="description_only",
+        ),
+    ],
+)
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_update_entry_success(
+    mock_rate, update, row_overrides, expected_cad, async_mock_db
+):
+    entry_id = fast_uuid()
+    row = _updated_row(id=entry_id, **row_overrides)
+    async_mock_db.execute = AsyncMock(return_value=_insert_result(row))
 
     updated = await update_entry(str(entry_id), update, async_mock_db)
 
-    assert updated.amount == Decimal("200.00")
-    assert updated.description == "Updated description"
+    assert updated.amount == row_overrides["amount"]
+    assert updated.description == row_overrides["description"]
     assert updated.version == 2
     assert updated.account_name == "Cash"
-
-
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_update_entry_partial_description_only(mock_inject, async_mock_db):
-    entry_id = uuid.uuid4()
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
-
-    entry = DBLedgerEntry(
-        id=entry_id,
-        account_id=account.id,
-        entry_type=EntryType.credit,
-        amount=Decimal("500.00"),
-        currency="USD",
-        description="Old",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        account=account,
-    )
-
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=entry)
-    async_mock_db.execute = AsyncMock(return_value=result)
-    async_mock_db.commit = AsyncMock()
-    async_mock_db.refresh = AsyncMock(side_effect=lambda e: e)
-
-    update = LedgerEntryUpdate(
-        amount=None,
-        description="New note only",
-    )
-
-    mock_inject.return_value = make_mock_entry_out(
-        entry, account_name="Cash", override_description="New note only"
-    )
-
-    updated = await update_entry(str(entry_id), update, async_mock_db)
-
-    assert updated.amount == Decimal("500.00")  # unchanged
-    assert updated.description == "New note only"
-    assert updated.version == 2
-
-
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_update_entry_not_found(async_mock_db):
-    entry_id = uuid.uuid4()
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=None)
-
-    async_mock_db.execute = AsyncMock(return_value=result)
-
-    update = LedgerEntryUpdate(amount=Decimal("100.00"))
-
-    with pytest.raises(HTTPException) as exc:
-        await update_entry(str(entry_id), update, async_mock_db)
-
-    assert exc.value.status_code == 404
-
-
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_update_entry_soft_deleted_excluded(async_mock_db):
-    entry_id = uuid.uuid4()
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
-
-    soft_deleted_entry = DBLedgerEntry(
-        id=entry_id,
-        account_id=account.id,
-        entry_type=EntryType.debit,
-        amount=Decimal("100.00"),
-        currency="USD",
-        description="Old",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=True,
-        version=1,
-        account=account,
+    assert updated.canadian_amount == expected_cad
+
+    # One UPDATE ... RETURNING, no prior SELECT
+    assert async_mock_db.execute.await_count == 1
+    stmt = str(async_mock_db.execute.await_args.args[0])
+    assert stmt.startswith("UPDATE ledger_entries")
+    assert "RETURNING" in stmt
+    # Only the supplied fields are SET
+    set_clause = stmt.split("WHERE")[0]
+    assert ("amount_cents=" in set_clause) == (update.amount is not None)
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        pytest.param(LedgerEntryUpdate(amount=D_100), id="not_found"),
+        # is_deleted rows are filtered out by both the UPDATE and the lookup
+        pytest.param(
+            LedgerEntryUpdate(description="Should not update"), id="soft_deleted"
+        ),
+    ],
+)
+async def test_update_entry_missing_raises_404(update, async_mock_db):
+    entry_id = fast_uuid()
+    async_mock_db.execute = execute_seq(
+        _insert_result(None),  # nothing updated
+        result_stub(scalar_one_or_none=None),  # lookup
     )
 
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=None)  # filtered out by query
-    async_mock_db.execute = AsyncMock(return_value=result)
-
-    update = LedgerEntryUpdate(description="Should not update")
-
     with pytest.raises(HTTPException) as exc:
         await update_entry(str(entry_id), update, async_mock_db)
 
     assert exc.value.status_code == 404
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
 async def test_update_entry_no_changes_provided(async_mock_db):
-    entry_id = uuid.uuid4()
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
-
-    entry = DBLedgerEntry(
-        id=entry_id,
-        account_id=account.id,
-        entry_type=EntryType.debit,
-        amount=Decimal("500.00"),
-        currency="USD",
-        description="Same",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        account=account,
-    )
-
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=entry)
-    async_mock_db.execute = AsyncMock(return_value=result)
+    entry_id = fast_uuid()
+    async_mock_db.execute = AsyncMock()
 
     update = LedgerEntryUpdate()  # nothing to update
 
@@ -422,36 +438,27 @@ async def test_update_entry_no_changes_provided(async_mock_db):
 
     assert exc.value.status_code == 400
     assert "no fields" in exc.value.detail.lower()
+    async_mock_db.execute.assert_not_awaited()
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
-async def test_update_entry_same_data_raises(async_mock_db):
-    entry_id = uuid.uuid4()
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
+async def test_update_entry_same_data_raises(async_mock_db, sample_account):
+    entry_id = fast_uuid()
 
-    entry = DBLedgerEntry(
+    entry = make_entry(
+        sample_account,
         id=entry_id,
-        account_id=account.id,
         entry_type=EntryType.credit,
-        amount=Decimal("100.00"),
-        currency="USD",
+        amount=D_100,
         description="Original",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        account=account,
     )
 
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=entry)
-    async_mock_db.execute = AsyncMock(return_value=result)
+    async_mock_db.execute = execute_seq(
+        _insert_result(None),  # WHERE requires a difference
+        result_stub(scalar_one_or_none=entry),
+    )
 
     update = LedgerEntryUpdate(
-        amount=Decimal("100.00"),  # same
+        amount=D_100,  # same
         description="Original",  # same
     )
 
@@ -462,34 +469,15 @@ async def test_update_entry_same_data_raises(async_mock_db):
     assert "no changes" in exc.value.detail.lower()
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
 async def test_delete_entry_success(async_mock_db):
-    entry_id = uuid.uuid4()
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
+    entry_id = fast_uuid()
 
-    entry = DBLedgerEntry(
-        id=entry_id,
-        account_id=account.id,
-        entry_type=EntryType.debit,
-        amount=Decimal("300.00"),
-        currency="USD",
-        description="To be deleted",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        account=account,
+    # UPDATE ... RETURNING id, is_deleted, version
+    result = result_stub(
+        one_or_none=SimpleNamespace(id=entry_id, is_deleted=True, version=2)
     )
 
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=entry)
-
     async_mock_db.execute = AsyncMock(return_value=result)
-    async_mock_db.commit = AsyncMock()
-    async_mock_db.refresh = AsyncMock(side_effect=lambda e: e)
 
     deleted = await delete_entry(str(entry_id), async_mock_db)
 
@@ -497,15 +485,17 @@ async def test_delete_entry_success(async_mock_db):
     assert deleted.id == entry_id
     assert deleted.is_deleted is True
     assert deleted.version == 2
+    async_mock_db.execute.assert_awaited_once()
+    async_mock_db.refresh.assert_not_called()
+    stmt = str(async_mock_db.execute.await_args.args[0])
+    assert stmt.startswith("UPDATE ledger_entries")
+    assert "RETURNING" in stmt
 
 
-@patch("app.services.entry_service.inject_cad_amount")
-@pytest.mark.asyncio
 async def test_delete_entry_not_found(async_mock_db):
-    entry_id = uuid.uuid4()
+    entry_id = fast_uuid()
 
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=None)
+    result = result_stub(one_or_none=None)
 
     async_mock_db.execute = AsyncMock(return_value=result)
 
@@ -516,14 +506,11 @@ async def test_delete_entry_not_found(async_mock_db):
     assert "not found" in exc.value.detail.lower()
 
 
-@pytest.mark.asyncio
 async def test_delete_entry_already_deleted(async_mock_db):
-    entry_id = uuid.uuid4()
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
+    entry_id = fast_uuid()
 
     # Simulate already deleted entry excluded by query
-    result = MagicMock()
-    result.scalar_one_or_none = MagicMock(return_value=None)
+    result = result_stub(one_or_none=None)
 
     async_mock_db.execute = AsyncMock(return_value=result)
 
@@ -533,44 +520,36 @@ async def test_delete_entry_already_deleted(async_mock_db):
     assert exc.value.status_code == 404
 
 
-@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=1.35)
-@pytest.mark.asyncio
-async def test_list_entries_basic(mock_rate, async_mock_db):
-    account = DBAccount(id=uuid.uuid4(), name="Cash", is_active=True)
-
-    entry = DBLedgerEntry(
-        id=uuid.uuid4(),
-        account_id=account.id,
-        entry_type=EntryType.debit,
-        amount=Decimal("50.00"),
-        currency="USD",
-        description="Listed",
-        idempotency_key=str(uuid.uuid4()),
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-        account=account,
-    )
-
-    # Mock count and entries
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_list_entries_basic(mock_rate, async_mock_db, sample_account):
+    row = {
+        "id": fast_uuid(),
+        "account_id": sample_account.id,
+        "account_name": sample_account.name,
+        "entry_type": EntryType.debit,
+        "amount": D_50,
+        "currency": "USD",
+        "description": "Listed",
+        "idempotency_key": str(fast_uuid()),
+        "date": NOW,
+        "created_at": NOW,
+        "updated_at": NOW,
+        "is_deleted": False,
+        "version": 1,
+        "canadian_amount": Decimal("67.50"),  # computed in SQL
+        "total_count": 1,
+    }
+
+    # Mock entries page; the total rides along on each row
     async_mock_db.execute = AsyncMock(
-        side_effect=[
-            MagicMock(scalar_one=MagicMock(return_value=1)),  # count
-            MagicMock(
-                scalars=MagicMock(
-                    return_value=MagicMock(all=MagicMock(return_value=[entry]))
-                )
-            ),  # entries
-        ]
+        return_value=result_stub(all=[_list_row(row)])
     )
 
     entries = await list_entries(
         db=async_mock_db,
         account_name="Cash",
         currency="USD",
-        entry_type="debit",
+        entry_type=EntryType.debit,
         start_date=None,
         end_date=None,
         limit=10,
@@ -581,30 +560,94 @@ async def test_list_entries_basic(mock_rate, async_mock_db):
     assert entries.total == 1
     assert isinstance(entries.entries, list)
     assert entries.entries[0].account_name == "Cash"
-    assert entries.entries[0].amount == Decimal("50.00")
+    assert entries.entries[0].amount == D_50
+    assert entries.entries[0].canadian_amount == Decimal("67.50")
+    assert entries.entries[0].entry_type is EntryType.debit
+    assert entries.entries[0].model_dump(mode="json")["amount"] == "50.00"
 
 
-@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=1.35)
-@pytest.mark.asyncio
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
 async def test_list_entries_empty_result(mock_rate, async_mock_db):
     async_mock_db.execute = AsyncMock(
-        side_effect=[
-            MagicMock(scalar_one=MagicMock(return_value=0)),  # count
-            MagicMock(
-                scalars=MagicMock(
-                    return_value=MagicMock(all=MagicMock(return_value=[]))
-                )
-            ),  # entries
-        ]
+        return_value=result_stub(all=[])
     )
 
     result = await list_entries(
         db=async_mock_db,
         account_name="Ghost",
         currency="USD",
-        entry_type="credit",
+        entry_type=EntryType.credit,
     )
 
     assert isinstance(result, LedgerEntryListResponse)
     assert result.total == 0
     assert result.entries == []
+
+
+@patch("app.services.entry_service.get_usd_to_cad_rate")
+async def test_list_entries_non_usd_filter_skips_rate_fetch(mock_rate, async_mock_db):
+    async_mock_db.execute = AsyncMock(
+        return_value=result_stub(all=[])
+    )
+
+    result = await list_entries(db=async_mock_db, currency="eur")
+
+    assert result.total == 0
+    mock_rate.assert_not_awaited()
+    page_stmt = async_mock_db.execute.await_args.args[0]
+    assert "NULL AS canadian_amount" in str(page_stmt)
+
+
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_list_entries_offset_past_end_counts_separately(mock_rate, async_mock_db):
+    async_mock_db.execute = execute_seq(
+        result_stub(all=[]),  # empty page
+        result_stub(scalar_one=5),  # count
+    )
+
+    result = await list_entries(db=async_mock_db, limit=10, offset=50)
+
+    assert result.total == 5
+    assert result.entries == []
+
+
+@patch("app.services.entry_service.get_usd_to_cad_rate", return_value=RATE)
+async def test_list_entries_full_page_uses_constant_queries(
+    mock_rate, async_mock_db, sample_account
+):
+    rows = [
+        {
+            "id": fast_uuid(),
+            "account_id": sample_account.id,
+            "account_name": sample_account.name,
+            "entry_type": EntryType.debit,
+            "amount": Decimal("1.00"),
+            "currency": "USD",
+            "description": f"Row {i}",
+            "idempotency_key": str(fast_uuid()),
+            "date": NOW,
+            "created_at": NOW,
+            "updated_at": NOW,
+            "is_deleted": False,
+            "version": 1,
+            "canadian_amount": RATE,
+            "total_count": 250,
+        }
+        for i in range(100)
+    ]
+
+    async_mock_db.execute = AsyncMock(
+        return_value=result_stub(all=[_list_row(row) for row in rows])
+    )
+
+    result = await list_entries(db=async_mock_db, limit=100)
+
+    assert len(result.entries) == 100
+    assert result.total == 250
+    assert async_mock_db.execute.await_count == 1
+
+    # account_name is read from the entry row; accounts is not touched
+    page_stmt = async_mock_db.execute.await_args_list[-1].args[0]
+    assert "accounts" not in str(page_stmt)
+    # CAD conversion is computed by the database, not per row in Python
+    assert "AS canadian_amount" in str(page_stmt)
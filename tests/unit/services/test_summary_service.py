@@ -1,125 +1,48 @@
 import pytest
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 from app.services.summary_service import get_summary
-from app.schemas.ledger_entry_schema import EntryType
 from app.schemas.summary_schema import SummaryOut
 
-
-@pytest.mark.asyncio
-async def test_get_summary_returns_zero_when_no_entries(async_mock_db):
-    # Simulate no account match (if account_name is given), and no entries
-    mock_result = MagicMock()
-    mock_result.all = MagicMock(return_value=[])
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
-
-    result = await get_summary(async_mock_db)
-
-    assert result == SummaryOut(
-        num_debits=0,
-        total_debit_amount=Decimal("0.00"),
-        num_credits=0,
-        total_credit_amount=Decimal("0.00"),
-        is_balanced=True,
-    )
-
-
-@pytest.mark.asyncio
-async def test_get_summary_balanced(async_mock_db):
-    # Simulate account lookup
-    mock_result = MagicMock()
-    mock_result.all = MagicMock(
-        return_value=[
-            (EntryType.debit, 2, Decimal("6000.00")),
-            (EntryType.credit, 2, Decimal("6000.00")),
-        ]
-    )
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
-
-    result = await get_summary(async_mock_db)
-
-    assert isinstance(result, SummaryOut)
-    assert result.num_debits == 2
-    assert result.total_debit_amount == Decimal("6000.00")
-    assert result.num_credits == 2
-    assert result.total_credit_amount == Decimal("6000.00")
-    assert result.is_balanced is True
-
-
-@pytest.mark.asyncio
-async def test_get_summary_unbalanced(async_mock_db):
-    # No account_name filter this time
-    mock_result = MagicMock()
-    mock_result.all = MagicMock(
-        return_value=[
-            (EntryType.debit, 1, Decimal("150.00")),
-            (EntryType.credit, 1, Decimal("100.00")),
-        ]
+# Shared amounts; Decimal is immutable so one instance serves every test
+D_0 = Decimal("0.00")
+D_100 = Decimal("100.00")
+D_150 = Decimal("150.00")
+D_300 = Decimal("300.00")
+D_450 = Decimal("450.00")
+D_6000 = Decimal("6000.00")
+
+
+def _expected(row: tuple) -> SummaryOut:
+    num_debits, total_debits, num_credits, total_credits, is_balanced = row
+    return SummaryOut(
+        num_debits=num_debits,
+        total_debit_amount=total_debits,
+        num_credits=num_credits,
+        total_credit_amount=total_credits,
+        is_balanced=is_balanced,
     )
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
 
-    result = await get_summary(async_mock_db)
 
-    assert isinstance(result, SummaryOut)
-    assert result.num_debits == 1
-    assert result.total_debit_amount == Decimal("150.00")
-    assert result.num_credits == 1
-    assert result.total_credit_amount == Decimal("100.00")
-    assert result.is_balanced is False
+# Each row is what the totals query yields: (num_debits, total_debits,
+# num_credits, total_credits, is_balanced); soft-deleted rows never reach it.
+# Expected summaries are built once at import, not per test.
+CASES = {
+    "no_entries": (0, D_0, 0, D_0, True),
+    "balanced": (2, D_6000, 2, D_6000, True),
+    "unbalanced": (1, D_150, 1, D_100, False),
+    "only_debits": (3, D_450, 0, D_0, False),
+    "only_credits": (0, D_0, 2, D_300, False),
+}
 
 
-@pytest.mark.asyncio
-async def test_get_summary_ignores_soft_deleted(async_mock_db):
-    entries_result = MagicMock()
-    entries_result.all = MagicMock(return_value=[])
-    async_mock_db.execute = AsyncMock(return_value=entries_result)
-
-    result = await get_summary(async_mock_db)
-
-    assert isinstance(result, SummaryOut)
-    assert result.num_debits == 0
-    assert result.total_credit_amount == Decimal("0.00")
-    assert result.is_balanced is True
-
-
-@pytest.mark.asyncio
-async def test_get_summary_with_only_debits(async_mock_db):
-    # Simulate a query that returns only debit entries
-    mock_result = MagicMock()
-    mock_result.all = MagicMock(
-        return_value=[
-            (EntryType.debit, 3, Decimal("450.00")),
-        ]
-    )
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
-
-    result = await get_summary(async_mock_db)
-
-    assert isinstance(result, SummaryOut)
-    assert result.num_debits == 3
-    assert result.total_debit_amount == Decimal("450.00")
-    assert result.num_credits == 0
-    assert result.total_credit_amount == Decimal("0.00")
-    assert result.is_balanced is False
-
-
-@pytest.mark.asyncio
-async def test_get_summary_with_only_credits(async_mock_db):
-    # Simulate a query that returns only credit entries
-    mock_result = MagicMock()
-    mock_result.all = MagicMock(
-        return_value=[
-            (EntryType.credit, 2, Decimal("300.00")),
-        ]
-    )
-    async_mock_db.execute = AsyncMock(return_value=mock_result)
-
-    result = await get_summary(async_mock_db)
+@pytest.mark.parametrize(
+    "row, expected",
+    [pytest.param(row, _expected(row), id=name) for name, row in CASES.items()],
+)
+async def test_get_summary(row, expected, async_mock_db):
+    async_mock_db.execute = AsyncMock(return_value=SimpleNamespace(one=lambda: row))
 
-    assert isinstance(result, SummaryOut)
-    assert result.num_debits == 0
-    assert result.total_debit_amount == Decimal("0.00")
-    assert result.num_credits == 2
-    assert result.total_credit_amount == Decimal("300.00")
-    assert result.is_balanced is False
+    assert await get_summary(async_mock_db) == expected
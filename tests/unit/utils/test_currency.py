@@ -1,28 +1,72 @@
+import httpx
+import orjson
 import pytest
-from unittest.mock import AsyncMock, Mock, patch
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
 
-from app.utils.currency import get_usd_to_cad_rate
+from app.utils.currency import (
+    clear_rate_cache,
+    get_usd_to_cad_rate,
+    warm_rate_cache,
+)
 
 
-@pytest.mark.asyncio
-async def test_get_usd_to_cad_rate_success():
-    mock_json = {
-        "data": [
-            {
-                "country_currency_desc": "Canada-Dollar",
-                "exchange_rate": "1.438",
-                "record_date": "2024-12-31",
-            }
-        ]
-    }
+@pytest.fixture(autouse=True)
+def _fresh_rate_cache():
+    clear_rate_cache()
+    yield
+    clear_rate_cache()
 
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.raise_for_status = Mock()
-    mock_response.json = Mock(return_value=mock_json)
 
-    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
-        mock_get.return_value = mock_response
-        rate = await get_usd_to_cad_rate()
+@pytest.fixture(scope="module")
+def mock_cad_response():
+    """A successful Treasury API response; read-only, so one per module."""
+    response = Mock()
+    response.status_code = 200
+    response.raise_for_status = Mock()
+    response.content = orjson.dumps(
+        {
+            "data": [
+                {
+                    "country_currency_desc": "Canada-Dollar",
+                    "exchange_rate": "1.438",
+                    "record_date": "2024-12-31",
+                }
+            ]
+        }
+    )
+    return response
 
-    assert rate == 1.438
+
+@pytest.fixture
+def mock_httpx_get(monkeypatch):
+    mock = AsyncMock()
+    monkeypatch.setattr("httpx.AsyncClient.get", mock)
+    return mock
+
+
+async def test_get_usd_to_cad_rate_success(mock_httpx_get, mock_cad_response):
+    mock_httpx_get.return_value = mock_cad_response
+    rate = await get_usd_to_cad_rate()
+
+    assert rate == Decimal("1.438")
+
+
+async def test_get_usd_to_cad_rate_is_cached(mock_httpx_get, mock_cad_response):
+    mock_httpx_get.return_value = mock_cad_response
+    first = await get_usd_to_cad_rate()
+    second = await get_usd_to_cad_rate()
+
+    assert first == second == Decimal("1.438")
+    mock_httpx_get.assert_awaited_once()
+
+
+async def test_warm_rate_cache_swallows_fetch_errors(
+    mock_httpx_get, mock_cad_response
+):
+    mock_httpx_get.side_effect = httpx.ConnectError("unreachable")
+    await warm_rate_cache()  # must not raise
+
+    mock_httpx_get.side_effect = None
+    mock_httpx_get.return_value = mock_cad_response
+    assert await get_usd_to_cad_rate() == Decimal("1.438")
@@ -1,118 +1,114 @@
 import pytest
-import uuid
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
 
 from fastapi import HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects import postgresql
 
 from app.utils import db_helpers
 from app.db.models import DBAccount, DBLedgerEntry
+from tests.conftest import fast_uuid, result_stub
 
 
-@pytest.mark.asyncio
-async def test_get_entry_or_raise_404_found():
-    entry = DBLedgerEntry(id=uuid.uuid4(), is_deleted=False)
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = entry
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = mock_result
+async def test_get_entry_or_raise_404_found(async_mock_db):
+    entry = DBLedgerEntry(id=fast_uuid(), is_deleted=False)
+    async_mock_db.execute.return_value = result_stub(scalar_one_or_none=entry)
 
-    result = await db_helpers.get_entry_or_raise_404(str(entry.id), db)
+    result = await db_helpers.get_entry_or_raise_404(str(entry.id), async_mock_db)
     assert result == entry
 
 
-@pytest.mark.asyncio
-async def test_get_entry_or_raise_404_not_found():
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+async def test_get_entry_or_raise_404_not_found(async_mock_db):
+    async_mock_db.execute.return_value = result_stub(scalar_one_or_none=None)
 
     with pytest.raises(HTTPException) as exc:
-        await db_helpers.get_entry_or_raise_404("nonexistent", db)
+        await db_helpers.get_entry_or_raise_404("nonexistent", async_mock_db)
 
     assert exc.value.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_get_debit_credit_totals():
-    db = AsyncMock(spec=AsyncSession)
-    expected = [("debit", 2, Decimal("100.00"))]
+async def test_get_debit_credit_totals(async_mock_db):
+    expected = (2, Decimal("100.00"), 1, Decimal("40.00"), False)
 
-    mock_result = MagicMock()
-    mock_result.all.return_value = expected
-    db.execute.return_value = mock_result
+    async_mock_db.execute.return_value = result_stub(one=expected)
 
-    result = await db_helpers.get_debit_credit_totals(db)
+    result = await db_helpers.get_debit_credit_totals(async_mock_db)
     assert result == expected
 
+    # All aggregates and the balance check come from a single FILTER query
+    # without GROUP BY
+    stmt = str(async_mock_db.execute.await_args.args[0])
+    assert stmt.count("FILTER (WHERE") == 6
+    assert "AS is_balanced" in stmt
+    assert "GROUP BY" not in stmt
 
-@pytest.mark.asyncio
-async def test_get_account_or_raise_404_found():
-    account = DBAccount(id=uuid.uuid4(), name="Cash")
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = MagicMock(
-        scalar_one_or_none=MagicMock(return_value=account)
-    )
 
-    result = await db_helpers.get_account_or_raise_404(account.id, db)
+def test_debit_credit_totals_read_back_as_two_place_zero_when_empty():
+    # With no matching rows SUM is NULL and COALESCE returns the bound fallback;
+    # it must come back through the Cents type as 0.00, not 0.0000
+    dialect = postgresql.asyncpg.dialect()
+    for column in (db_helpers._TOTAL_DEBITS, db_helpers._TOTAL_CREDITS):
+        fallback = column.compile(dialect=dialect).params["coalesce_1"]
+        process = column.type.result_processor(dialect, None)
+        assert str(process(Decimal(fallback))) == "0.00"
+
+
+async def test_get_account_or_raise_404_found(async_mock_db):
+    account = DBAccount(id=fast_uuid(), name="Cash")
+    async_mock_db.get.return_value = account
+
+    result = await db_helpers.get_account_or_raise_404(account.id, async_mock_db)
     assert result == account
+    async_mock_db.get.assert_awaited_once_with(DBAccount, account.id)
+    async_mock_db.execute.assert_not_awaited()
 
 
-@pytest.mark.asyncio
-async def test_get_account_or_raise_404_not_found():
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+async def test_get_account_or_raise_404_not_found(async_mock_db):
+    async_mock_db.get.return_value = None
 
     with pytest.raises(HTTPException):
-        await db_helpers.get_account_or_raise_404(uuid.uuid4(), db)
+        await db_helpers.get_account_or_raise_404(fast_uuid(), async_mock_db)
 
 
-@pytest.mark.asyncio
-async def test_account_name_exists_true():
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = MagicMock(
-        scalar_one_or_none=MagicMock(return_value=DBAccount())
-    )
+async def test_account_name_exists_true(async_mock_db):
+    async_mock_db.execute.return_value = result_stub(scalar=True)
 
-    assert await db_helpers.account_name_exists("Cash", db) is True
+    assert await db_helpers.account_name_exists("Cash", async_mock_db) is True
+    assert "EXISTS" in str(async_mock_db.execute.await_args.args[0])
 
 
-@pytest.mark.asyncio
-async def test_account_name_exists_false():
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+async def test_account_name_exists_false(async_mock_db):
+    async_mock_db.execute.return_value = result_stub(scalar=False)
 
-    assert await db_helpers.account_name_exists("Ghost", db) is False
+    assert await db_helpers.account_name_exists("Ghost", async_mock_db) is False
 
 
-@pytest.mark.asyncio
-async def test_get_active_account_by_name_found():
+async def test_get_active_account_by_name_found(async_mock_db):
     account = DBAccount(name="Active", is_active=True)
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = MagicMock(
-        scalar_one_or_none=MagicMock(return_value=account)
-    )
+    async_mock_db.execute.return_value = result_stub(scalar_one_or_none=account)
 
-    result = await db_helpers.get_active_account_by_name("Active", db)
+    result = await db_helpers.get_active_account_by_name("Active", async_mock_db)
     assert result == account
 
 
-@pytest.mark.asyncio
-async def test_get_active_account_by_name_not_found():
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+async def test_get_active_account_by_name_not_found(async_mock_db):
+    async_mock_db.execute.return_value = result_stub(scalar_one_or_none=None)
 
     with pytest.raises(HTTPException):
-        await db_helpers.get_active_account_by_name("Inactive", db)
+        await db_helpers.get_active_account_by_name("Inactive", async_mock_db)
+
+
+async def test_get_active_account_id_selects_only_id(async_mock_db):
+    account_id = fast_uuid()
+    async_mock_db.execute.return_value = result_stub(scalar_one_or_none=account_id)
+
+    assert await db_helpers.get_active_account_id("Cash", async_mock_db) == account_id
+    stmt = str(async_mock_db.execute.await_args.args[0])
+    assert stmt.startswith("SELECT accounts.id \n")
 
 
-@pytest.mark.asyncio
-async def test_get_account_by_name_returns_account():
+async def test_get_account_by_name_returns_account(async_mock_db):
     account = DBAccount(name="Cash")
-    db = AsyncMock(spec=AsyncSession)
-    db.execute.return_value = MagicMock(
-        scalar_one_or_none=MagicMock(return_value=account)
-    )
+    async_mock_db.execute.return_value = result_stub(scalar_one_or_none=account)
 
-    result = await db_helpers.get_account_by_name("Cash", db)
+    result = await db_helpers.get_account_by_name("Cash", async_mock_db)
     assert result == account
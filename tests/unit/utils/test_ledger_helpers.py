@@ -1,38 +1,74 @@
 import pytest
-import uuid
 from decimal import Decimal
 from unittest.mock import patch
-from datetime import datetime, timezone
-from app.utils.ledger_helpers import inject_cad_amount, normalize_entry_type
-from app.db.models.ledger_entry_model import DBLedgerEntry
+from app.utils.ledger_helpers import (
+    build_entry_out,
+    to_cad_amount,
+    inject_cad_amount,
+    normalize_entry_type,
+)
+from app.db.models.ledger_entry_model import EntryType as DBEntryType
 from app.schemas.ledger_entry_schema import EntryType
+from app.db.models import DBAccount
+from tests.conftest import NOW, fast_uuid, make_entry
 
+# Shared amounts; Decimal is immutable so one instance serves every test
+RATE = Decimal("1.35")
+D_100 = Decimal("100.00")
+D_135 = Decimal("135.00")
 
-@pytest.mark.asyncio
-@patch("app.utils.ledger_helpers.get_usd_to_cad_rate", return_value=1.35)
+# Read-only: the helpers under test never mutate the entry
+SAMPLE_ENTRY = make_entry(
+    DBAccount(id=fast_uuid(), name="Cash"),
+    entry_type="debit",
+    amount=D_100,
+)
+
+
+@patch("app.utils.ledger_helpers.get_usd_to_cad_rate", return_value=RATE)
 async def test_inject_cad_amount(mock_rate):
-    entry = DBLedgerEntry(
-        id=uuid.uuid4(),
-        account_id=uuid.uuid4(),
-        idempotency_key=str(uuid.uuid4()),
-        entry_type="debit",
-        amount=Decimal("100.00"),
-        currency="USD",
-        description="Test",
-        date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-        is_deleted=False,
-        version=1,
-    )
-
-    result = await inject_cad_amount(entry)
-    assert result.canadian_amount == Decimal("135.00")
-
-
-def test_normalize_entry_type_enum():
-    assert normalize_entry_type(EntryType.debit) == "debit"
-
-
-def test_normalize_entry_type_string():
-    assert normalize_entry_type("credit") == "credit"
+    result = await inject_cad_amount(SAMPLE_ENTRY)
+    assert result.canadian_amount == D_135
+
+
+def test_build_entry_out_from_row_mapping():
+    row = {
+        "id": fast_uuid(),
+        "account_id": fast_uuid(),
+        "account_name": "Cash",
+        "entry_type": DBEntryType.credit,
+        "amount": Decimal("10.00"),
+        "currency": "USD",
+        "description": None,
+        "idempotency_key": str(fast_uuid()),
+        "date": NOW,
+        "created_at": NOW,
+        "updated_at": NOW,
+        "is_deleted": False,
+        "version": 1,
+    }
+
+    result = build_entry_out(row, RATE)
+
+    assert result.entry_type is EntryType.credit
+    assert result.canadian_amount == Decimal("13.50")
+    assert result.model_dump()["account_name"] == "Cash"
+
+
+def test_to_cad_amount_rounds_half_up_like_sql():
+    assert to_cad_amount(D_100, RATE) == D_135
+    # 0.405 rounds up, matching ROUND() in the listing query
+    assert to_cad_amount(Decimal("0.30"), RATE) == Decimal("0.41")
+    assert str(to_cad_amount(Decimal("1.00"), Decimal("1.4380"))) == "1.44"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (EntryType.debit, "debit"),
+        ("credit", "credit"),
+        (DBEntryType.credit, "credit"),
+    ],
+)
+def test_normalize_entry_type(value, expected):
+    assert normalize_entry_type(value) == expected